@@ -0,0 +1,183 @@
+import time
+from typing import Dict, List
+from urllib.parse import urljoin
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from bs4 import BeautifulSoup
+
+from page_scripts import REVIEW_BLOCKS_SCRIPT, REVIEWS_READY_SCRIPT, TEXT_QUERY_SCRIPT
+from review_blocks import detect_review_blocks
+from text_selectors import compile_selector, select_soup
+
+
+class SeleniumBackend:
+
+    live = True
+    kind = 'dom'
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def find_all(self, selector: str, root=None) -> List:
+        compiled = compile_selector(selector)
+        if compiled.texts:
+            # текстовые условия проверяются за один проход внутри страницы
+            return self.driver.execute_script(TEXT_QUERY_SCRIPT, root, compiled.script_arg()) or []
+        return (self.driver if root is None else root).find_elements(By.CSS_SELECTOR, selector)
+
+    def find_by_tag(self, tag: str, root=None) -> List:
+        return (self.driver if root is None else root).find_elements(By.TAG_NAME, tag)
+
+    def text(self, element) -> str:
+        return element.text
+
+    def attribute(self, element, name: str) -> str:
+        return element.get_attribute(name) or ''
+
+    def outer_html(self, element) -> str:
+        return element.get_attribute('outerHTML') or ''
+
+    def tag_name(self, element) -> str:
+        return element.tag_name
+
+    def execute_script(self, script: str, *args):
+        return self.driver.execute_script(script, *args)
+
+    def review_blocks(self, params: Dict, root=None) -> List[Dict]:
+        return self.driver.execute_script(REVIEW_BLOCKS_SCRIPT, root, params) or []
+
+    def scroll_into_view(self, element):
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+
+    def scroll_to(self, fraction: float):
+        self.driver.execute_script(f"window.scrollTo(0, document.body.scrollHeight*{fraction});")
+
+    def click(self, element):
+        try:
+            element.click()
+        except Exception:
+            self.driver.execute_script("arguments[0].click();", element)
+
+    def wait_for_body(self, timeout: float):
+        WebDriverWait(self.driver, timeout).until(
+            EC.presence_of_element_located((By.TAG_NAME, "body"))
+        )
+
+    def wait_for_any(self, selectors: List[str], timeout: float) -> bool:
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.25).until(
+                lambda driver: driver.execute_script(REVIEWS_READY_SCRIPT, selectors)
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def pause(self, seconds: float):
+        time.sleep(seconds)
+
+    def navigate(self, url: str):
+        self.driver.get(url)
+
+    @property
+    def current_url(self) -> str:
+        return self.driver.current_url
+
+    def page_source(self) -> str:
+        return self.driver.page_source
+
+
+class SoupBackend:
+
+    live = False
+    kind = 'offline'
+
+    def __init__(self, html: str = "", url: str = "", pages: Dict[str, str] = None):
+        self.pages = pages or {}
+        self.url = url
+        self.soup = None
+        self.load(html or self.pages.get(url, ""))
+
+    def load(self, html: str):
+        self.soup = BeautifulSoup(html, 'html.parser')
+
+    def find_all(self, selector: str, root=None) -> List:
+        return select_soup(self.soup if root is None else root, selector)
+
+    def find_by_tag(self, tag: str, root=None) -> List:
+        return (self.soup if root is None else root).find_all(tag)
+
+    def text(self, element) -> str:
+        return element.get_text('\n', strip=True)
+
+    def attribute(self, element, name: str) -> str:
+        value = element.get(name)
+        if isinstance(value, list):
+            return ' '.join(value)
+        return value or ''
+
+    def outer_html(self, element) -> str:
+        return str(element)
+
+    def tag_name(self, element) -> str:
+        return element.name
+
+    def execute_script(self, script: str, *args):
+        return None
+
+    def review_blocks(self, params: Dict, root=None) -> List[Dict]:
+        return detect_review_blocks(self.soup if root is None else root, params)
+
+    def scroll_into_view(self, element):
+        pass
+
+    def scroll_to(self, fraction: float):
+        pass
+
+    def click(self, element):
+        href = element.get('href') if element.name == 'a' else None
+        if href:
+            self.navigate(urljoin(self.url, href))
+
+    def wait_for_body(self, timeout: float):
+        pass
+
+    def wait_for_any(self, selectors: List[str], timeout: float) -> bool:
+        return any(select_soup(self.soup, selector) for selector in selectors)
+
+    def pause(self, seconds: float):
+        pass
+
+    def navigate(self, url: str):
+        if url in self.pages:
+            self.url = url
+            self.load(self.pages[url])
+
+    @property
+    def current_url(self) -> str:
+        return self.url
+
+    def page_source(self) -> str:
+        return str(self.soup)
+
+
+class HttpPageBackend(SoupBackend):
+
+    kind = 'ssr'
+
+    def __init__(self, session, url: str, timeout: float = 15):
+        self.session = session
+        self.timeout = timeout
+        super().__init__(url=url)
+        self.navigate(url)
+
+    def navigate(self, url: str):
+        response = self.session.get(url, timeout=self.timeout, headers={'Accept': 'text/html'})
+        response.raise_for_status()
+        if 'charset' not in response.headers.get('Content-Type', ''):
+            # requests по умолчанию считает такой HTML latin-1
+            response.encoding = 'utf-8'
+        self.url = response.url
+        self.load(response.text)
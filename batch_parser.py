@@ -3,16 +3,37 @@ import time
 from typing import List
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-def parse_multiple_products(product_urls: List[str], config: ParserConfig = None, max_workers: int = 1):
+from config import ParserConfig
+from disk_cache import cache_stats
+from driver_pool import DriverPool
+from offline_parser import parse_multiple_products_offline
+from simple_runner import parse_ozon_reviews
+from ssr_fast_path import fast_path_stats
+from tab_scheduler import parse_with_tabs
+
+def parse_multiple_products(product_urls: List[str], config: ParserConfig = None, max_workers: int = 1, pool=None):
     if config is None:
         config = ParserConfig()
     
+    # отчёт в конце относится только к этому запуску
+    fast_path_stats.reset()
+    cache_stats.reset()
     results = []
     
-    if max_workers == 1:
+    if pool is None and config.backend == 'selenium':
+        with DriverPool(config, size=max(max_workers, config.driver_pool_size)) as pool:
+            if not config.ssr_fast_path:
+                pool.prewarm(min(pool.size, len(product_urls)))
+            return parse_multiple_products(product_urls, config, max_workers, pool)
+
+    if config.extraction_mode == 'offline':
+        results = parse_multiple_products_offline(product_urls, config, max_workers, pool)
+    elif config.tabs_per_browser > 1:
+        results = parse_with_tabs(product_urls, config, pool, max_workers)
+    elif max_workers == 1:
         for i, url in enumerate(product_urls, 1):
             print(f"\nПарсинг товара {i}/{len(product_urls)} ---")
-            result = parse_ozon_reviews(url, config)
+            result = parse_ozon_reviews(url, config, pool=pool)
             results.append(result)
             
             if i < len(product_urls):
@@ -21,7 +42,7 @@ def parse_multiple_products(product_urls: List[str], config: ParserConfig = None
     else:
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_url = {
-                executor.submit(parse_ozon_reviews, url, config): url 
+                executor.submit(parse_ozon_reviews, url, config, pool): url 
                 for url in product_urls
             }
             
@@ -35,6 +56,22 @@ def parse_multiple_products(product_urls: List[str], config: ParserConfig = None
                     print(f"Ошибка для {url}: {e}")
                     results.append({'error': str(e), 'product_url': url, 'reviews': []})
     
+    if pool:
+        report = pool.launch_report()
+        print(f"Запущено браузеров: {report['browsers_launched']}, "
+              f"время запуска: {report['launch_seconds_total']:.1f} с (макс. {report['launch_seconds_max']:.1f} с), "
+              f"память на браузер: {report['rss_mb_avg']:.0f} МБ")
+        for endpoint in report.get('endpoints', []):
+            print(f"  {endpoint['url']}: сессий {endpoint['sessions_started']}, "
+                  f"занято {endpoint['in_use']}/{endpoint['capacity']}, ошибок {endpoint['failures']}")
+    if config.ssr_fast_path:
+        report = fast_path_stats.report()
+        print(f"Серверная разметка: {report['ssr_hits']}, через браузер: {report['browser_fallbacks']}, "
+              f"доля быстрого пути: {report['ssr_hit_rate']:.0%}")
+    if config.disk_cache_dir:
+        report = cache_stats.report()
+        print(f"Кэш ресурсов: попаданий {report['cache_hits']}, промахов {report['cache_misses']}, "
+              f"доля попаданий: {report['cache_hit_ratio']:.0%}, скачано {report['mb_downloaded']:.1f} МБ")
     return results
 
 
@@ -45,4 +82,18 @@ def load_urls_from_csv(csv_file: str) -> List[str]:
         for row in reader:
             if row and row[0].startswith('http'):
                 urls.append(row[0])
-    return urls
\ No newline at end of file
+    return urls
+
+
+def parse_products_from_csv(csv_file: str, config: ParserConfig = None, max_workers: int = 1):
+    if config is None:
+        config = ParserConfig()
+
+    if config.backend != 'selenium':
+        return parse_multiple_products(load_urls_from_csv(csv_file), config, max_workers)
+
+    with DriverPool(config, size=max(max_workers, config.driver_pool_size)) as pool:
+        if not config.ssr_fast_path:
+            pool.prewarm()
+        product_urls = load_urls_from_csv(csv_file)
+        return parse_multiple_products(product_urls, config, max_workers, pool)
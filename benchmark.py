@@ -0,0 +1,239 @@
+import json
+import os
+import sys
+import time
+from dataclasses import replace
+from typing import Dict, List
+
+from backends import SeleniumBackend, SoupBackend
+from config import ParserConfig
+from driver_factory import create_driver
+from ozon_reviews_parser import FILLED_STAR_SELECTOR, RATING_SELECTORS, OzonReviewsParserImproved
+from process_memory import driver_rss_bytes
+from review_blocks import block_params
+
+PAGE_METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+return {
+    requests: performance.getEntriesByType('resource').length + 1,
+    dom_ready_ms: nav.domContentLoadedEventEnd || 0,
+    load_ms: nav.loadEventEnd || 0,
+    dom_nodes: document.getElementsByTagName('*').length
+};
+"""
+
+
+def measure_page(driver, url: str) -> Dict:
+    driver.get_log('performance')
+    started = time.monotonic()
+    driver.get(url)
+    wall_seconds = time.monotonic() - started
+    metrics = driver.execute_script(PAGE_METRICS_SCRIPT)
+    # в отличие от transferSize, encodedDataLength известен и для сторонних ресурсов без Timing-Allow-Origin;
+    # в режиме network ответы API при этом вычитываются из журнала раньше парсера
+    metrics['bytes'] = network_bytes(driver.get_log('performance'))
+    metrics['wall_seconds'] = wall_seconds
+    metrics['rss_mb'] = driver_rss_bytes(driver) / 1024 / 1024
+    return metrics
+
+
+def network_bytes(entries: List[Dict]) -> int:
+    total = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        if message.get('method') == 'Network.loadingFinished':
+            total += message['params'].get('encodedDataLength', 0)
+    return int(total)
+
+
+def measure_reviews(driver, config: ParserConfig, metrics: Dict) -> Dict:
+    parser = OzonReviewsParserImproved(config)
+    parser.debug = False
+    parser.attach_driver(driver)
+    started = time.monotonic()
+    reviews = parser.parse_loaded_page()
+    elapsed = metrics['wall_seconds'] + time.monotonic() - started
+    metrics['reviews'] = len(reviews)
+    metrics['reviews_per_second'] = len(reviews) / elapsed if elapsed else 0
+    return metrics
+
+
+def run_benchmark(url: str, variants: Dict[str, ParserConfig], runs: int = 3,
+                  parse_reviews: bool = False) -> Dict[str, Dict]:
+    results = {}
+    for name, config in variants.items():
+        samples = []
+        driver = create_driver(replace(config, network_log=True))
+        try:
+            for _ in range(runs):
+                driver.delete_all_cookies()
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+                metrics = measure_page(driver, url)
+                if parse_reviews:
+                    metrics = measure_reviews(driver, config, metrics)
+                samples.append(metrics)
+        finally:
+            driver.quit()
+        results[name] = _average(samples)
+    return results
+
+
+def blocking_variants(base: ParserConfig) -> Dict[str, ParserConfig]:
+    return {
+        'no_blocking': replace(base, block_resources=False),
+        'types_only': replace(base, block_resources=True, block_third_party=False),
+        'types_and_third_party': replace(base, block_resources=True, block_third_party=True),
+    }
+
+
+def launch_profile_variants(base: ParserConfig) -> Dict[str, ParserConfig]:
+    return {
+        'default': replace(base, launch_profile='default'),
+        'dense': replace(base, launch_profile='dense'),
+    }
+
+
+def device_variants(base: ParserConfig) -> Dict[str, ParserConfig]:
+    return {
+        'desktop': replace(base, device_mode='desktop'),
+        'mobile': replace(base, device_mode='mobile'),
+    }
+
+
+def benchmark_fixture_pages(paths: List[str], repeat: int = 10) -> Dict:
+    pages = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            pages.append(f.read())
+
+    parser = OzonReviewsParserImproved()
+    parser.debug = False
+    reviews = 0
+    started = time.monotonic()
+    for _ in range(repeat):
+        for html in pages:
+            reviews += len(parser.parse_with_backend(SoupBackend(html)))
+    elapsed = time.monotonic() - started
+
+    return {
+        'pages': len(pages) * repeat,
+        'reviews': reviews,
+        'seconds': elapsed,
+        'pages_per_second': len(pages) * repeat / elapsed if elapsed else 0,
+    }
+
+
+class CountingBackend:
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self.backend, name)
+        if not callable(attribute):
+            return attribute
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attribute(*args, **kwargs)
+        return counted
+
+
+def legacy_div_scan(backend) -> List[Dict]:
+    # прежний _find_reviews_on_current_page: текст и класс каждого div на странице
+    reviews = []
+    for element in backend.find_by_tag("div"):
+        text = backend.text(element).strip()
+        if 30 < len(text) < 2000 and not any(word in text.lower() for word in ['cookie', 'реклама', 'навигация', 'меню']):
+            reviews.append({'text': text, 'element_class': backend.attribute(element, 'class')})
+    return reviews[:50]
+
+
+def benchmark_block_detection(paths: List[str], repeat: int = 5, driver=None) -> Dict[str, Dict]:
+    results = {}
+    for name, detect in [('div_scan', legacy_div_scan), ('scored_blocks', scored_blocks)]:
+        calls = blocks = 0
+        started = time.monotonic()
+        for _ in range(repeat):
+            for path in paths:
+                backend = CountingBackend(_recorded_page_backend(path, driver))
+                blocks += len(detect(backend))
+                calls += backend.calls
+        elapsed = time.monotonic() - started
+        pages = len(paths) * repeat
+        results[name] = {
+            'pages': pages,
+            'blocks_per_page': blocks / pages if pages else 0,
+            'backend_calls_per_page': calls / pages if pages else 0,
+            'ms_per_page': elapsed * 1000 / pages if pages else 0,
+        }
+    return results
+
+
+def scored_blocks(backend) -> List[Dict]:
+    # без прокрутки и пауз парсера, чтобы сравнение с legacy_div_scan было честным
+    return backend.review_blocks(block_params(RATING_SELECTORS, FILLED_STAR_SELECTOR))
+
+
+def _recorded_page_backend(path: str, driver=None):
+    if driver is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            return SoupBackend(f.read())
+    driver.get('file://' + os.path.abspath(path))
+    return SeleniumBackend(driver)
+
+
+def print_results(results: Dict[str, Dict]):
+    with_reviews = any('reviews_per_second' in metrics for metrics in results.values())
+    header = (f"{'вариант':<28}{'KB':>10}{'запросов':>10}{'DOM ready, мс':>15}{'load, мс':>10}"
+              f"{'узлов DOM':>11}{'RSS, МБ':>9}")
+    if with_reviews:
+        header += f"{'отзывов':>9}{'отзывов/с':>11}"
+    print(header)
+    for name, metrics in results.items():
+        line = (
+            f"{name:<28}{metrics['bytes'] / 1024:>10.0f}{metrics['requests']:>10.0f}"
+            f"{metrics['dom_ready_ms']:>15.0f}{metrics['load_ms']:>10.0f}{metrics['dom_nodes']:>11.0f}"
+            f"{metrics['rss_mb']:>9.0f}"
+        )
+        if with_reviews:
+            line += f"{metrics['reviews']:>9.0f}{metrics['reviews_per_second']:>11.1f}"
+        print(line)
+
+
+def _average(samples: List[Dict]) -> Dict:
+    return {key: sum(sample[key] for sample in samples) / len(samples) for key in samples[0]}
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(1)
+
+    if sys.argv[1] == '--fixtures':
+        print(benchmark_fixture_pages(sys.argv[2:]))
+        return
+
+    if sys.argv[1] in ('--blocks', '--blocks-live'):
+        driver = create_driver(ParserConfig(headless=True)) if sys.argv[1] == '--blocks-live' else None
+        try:
+            for name, metrics in benchmark_block_detection(sys.argv[2:], driver=driver).items():
+                print(f"{name:<16}блоков/стр. {metrics['blocks_per_page']:>6.1f}  "
+                      f"вызовов/стр. {metrics['backend_calls_per_page']:>8.0f}  мс/стр. {metrics['ms_per_page']:>8.1f}")
+        finally:
+            if driver:
+                driver.quit()
+        return
+
+    url = sys.argv[1]
+    config = ParserConfig(headless=True)
+    print_results(run_benchmark(url, blocking_variants(config)))
+    print_results(run_benchmark(url, launch_profile_variants(config)))
+    print_results(run_benchmark(url, device_variants(config), parse_reviews=True))
+
+
+if __name__ == "__main__":
+    main()
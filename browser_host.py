@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from config import ParserConfig
+from driver_factory import build_chrome_options, find_chrome_binary
+
+
+def launch_debug_browser(config: ParserConfig, port: int, profile_dir: str) -> subprocess.Popen:
+    os.makedirs(profile_dir, exist_ok=True)
+    args = [
+        find_chrome_binary(config),
+        f'--remote-debugging-port={port}',
+        '--remote-debugging-address=127.0.0.1',
+    ]
+    args.extend(build_chrome_options(config, profile_dir).arguments)
+    return subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def supervise(config: ParserConfig, ports: List[int], profile_root: str = "profiles/host"):
+    processes: Dict[int, subprocess.Popen] = {}
+    print("Адреса для ParserConfig.debugger_address: " + ",".join(f"127.0.0.1:{port}" for port in ports))
+    try:
+        while True:
+            for port in ports:
+                process = processes.get(port)
+                if process is None or process.poll() is not None:
+                    if process is not None:
+                        print(f"Chrome на порту {port} завершился, перезапускаем")
+                    processes[port] = launch_debug_browser(
+                        config, port, os.path.join(profile_root, f"port-{port}")
+                    )
+            time.sleep(2)
+    except KeyboardInterrupt:
+        for process in processes.values():
+            process.terminate()
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(1)
+
+    first_port = int(sys.argv[1])
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    config = ParserConfig(headless=True)
+    supervise(config, list(range(first_port, first_port + count)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+import json
+import math
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, List
+
+import trio
+from trio_websocket import ConnectionClosed, open_websocket_url
+
+from config import ParserConfig
+from device_emulation import emulation_commands
+from driver_factory import build_chrome_options, find_chrome_binary
+from page_scripts import READY_SELECTORS, REVIEWS_READY_SCRIPT, SCROLL_TO_REVIEWS_SCRIPT, WIDGET_STATES_SCRIPT
+from resource_blocking import set_blocked_urls_async
+from review_json import (
+    dedupe_reviews, extract_reviews_from_payload, extract_reviews_from_widget_state, is_review_payload_url
+)
+from simple_runner import build_result, save_result
+
+DEVTOOLS_URL_PATTERN = re.compile(rb'DevTools listening on (ws://\S+)')
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+class CdpError(Exception):
+    pass
+
+
+class _Waiter:
+
+    def __init__(self):
+        self.event = trio.Event()
+        self.result = None
+        self.error = None
+
+
+class CdpConnection:
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self._next_id = 0
+        self._pending = {}
+        self._listeners = {}
+        self.closed = False
+
+    async def send(self, method: str, params: Dict = None, session_id: str = None) -> Dict:
+        if self.closed:
+            raise CdpError(f"{method}: соединение с браузером закрыто")
+        self._next_id += 1
+        message = {'id': self._next_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+
+        waiter = _Waiter()
+        self._pending[message['id']] = waiter
+        try:
+            await self.websocket.send_message(json.dumps(message))
+        except ConnectionClosed:
+            self._pending.pop(message['id'], None)
+            raise CdpError(f"{method}: соединение с браузером закрыто")
+        await waiter.event.wait()
+
+        if waiter.error is not None:
+            raise CdpError(f"{method}: {waiter.error}")
+        return waiter.result
+
+    def listen(self, session_id: str):
+        send_channel, receive_channel = trio.open_memory_channel(math.inf)
+        self._listeners[session_id] = send_channel
+        return receive_channel
+
+    def unlisten(self, session_id: str):
+        channel = self._listeners.pop(session_id, None)
+        if channel:
+            channel.close()
+
+    async def read_messages(self):
+        try:
+            while True:
+                message = json.loads(await self.websocket.get_message())
+                if 'id' in message:
+                    waiter = self._pending.pop(message['id'], None)
+                    if waiter:
+                        waiter.result = message.get('result', {})
+                        waiter.error = message.get('error')
+                        waiter.event.set()
+                else:
+                    channel = self._listeners.get(message.get('sessionId'))
+                    if channel:
+                        channel.send_nowait(message)
+        except ConnectionClosed:
+            self.closed = True
+            for waiter in self._pending.values():
+                waiter.error = "соединение с браузером закрыто"
+                waiter.event.set()
+            self._pending.clear()
+
+
+class CdpPage:
+
+    def __init__(self, connection: CdpConnection, config: ParserConfig):
+        self.connection = connection
+        self.config = config
+        self.target_id = None
+        self.session_id = None
+        self.events = None
+        self.product_id = None
+        self.browser_wait_seconds = 0.0
+        self.browser_rss_bytes = 0
+
+    async def open(self):
+        started = time.monotonic()
+        target = await self.connection.send('Target.createTarget', {'url': 'about:blank'})
+        self.target_id = target['targetId']
+        attached = await self.connection.send(
+            'Target.attachToTarget', {'targetId': self.target_id, 'flatten': True}
+        )
+        self.session_id = attached['sessionId']
+        self.events = self.connection.listen(self.session_id)
+
+        await self.send('Page.enable')
+        await self.send('Network.enable')
+        if self.config.block_resources:
+            await set_blocked_urls_async(self.send, self.config)
+        for method, params in emulation_commands(self.config):
+            await self.send(method, params)
+        self.browser_wait_seconds = time.monotonic() - started
+
+    async def close(self):
+        self.connection.unlisten(self.session_id)
+        try:
+            await self.connection.send('Target.closeTarget', {'targetId': self.target_id})
+        except CdpError:
+            pass
+
+    async def send(self, method: str, params: Dict = None) -> Dict:
+        return await self.connection.send(method, params, self.session_id)
+
+    async def evaluate(self, script: str, *args):
+        expression = f"(function() {{{script}}}).apply(null, {json.dumps(list(args))})"
+        response = await self.send('Runtime.evaluate', {
+            'expression': expression,
+            'returnByValue': True,
+            'awaitPromise': True,
+        })
+        if 'exceptionDetails' in response:
+            raise CdpError(response['exceptionDetails'].get('text', 'ошибка выполнения скрипта'))
+        return response['result'].get('value')
+
+    async def navigate(self, url: str):
+        await self.send('Page.navigate', {'url': url})
+
+    async def wait_for_reviews_ready(self) -> bool:
+        with trio.move_on_after(self.config.review_ready_timeout):
+            while True:
+                try:
+                    if await self.evaluate(REVIEWS_READY_SCRIPT, READY_SELECTORS):
+                        return True
+                    await self.evaluate(SCROLL_TO_REVIEWS_SCRIPT)
+                except CdpError:
+                    pass
+                await trio.sleep(0.25)
+        return False
+
+    async def collect_reviews(self) -> List[Dict]:
+        reviews = []
+
+        states = await self.evaluate(WIDGET_STATES_SCRIPT) or {}
+        for key, state in states.items():
+            if key.startswith(('webListReviews', 'webReviews')):
+                reviews.extend(extract_reviews_from_widget_state(state))
+
+        for request_id in self._review_payload_requests():
+            try:
+                body = await self.send('Network.getResponseBody', {'requestId': request_id})
+            except CdpError:
+                continue
+            reviews.extend(extract_reviews_from_payload(body.get('body', '')))
+
+        return dedupe_reviews(reviews)
+
+    def _review_payload_requests(self) -> List[str]:
+        request_ids = []
+        while True:
+            try:
+                message = self.events.receive_nowait()
+            except (trio.WouldBlock, trio.EndOfChannel):
+                break
+            if message.get('method') != 'Network.responseReceived':
+                continue
+            params = message['params']
+            if is_review_payload_url(params['response']['url']):
+                request_ids.append(params['requestId'])
+        return request_ids
+
+
+@asynccontextmanager
+async def launch_browser(config: ParserConfig):
+    profile_dir = tempfile.mkdtemp(prefix='ozon_cdp_')
+    args = [find_chrome_binary(config), '--remote-debugging-port=0', f'--user-data-dir={profile_dir}']
+    args.extend(build_chrome_options(config).arguments)
+
+    process = await trio.lowlevel.open_process(args, stderr=subprocess.PIPE)
+    try:
+        async with trio.open_nursery() as nursery:
+            with trio.fail_after(30):
+                ws_url = await _read_devtools_url(process.stderr)
+            # дальше stderr только вычитывается: заполненный канал остановил бы Chrome
+            nursery.start_soon(_drain, process.stderr)
+            try:
+                yield ws_url
+            finally:
+                nursery.cancel_scope.cancel()
+    finally:
+        process.terminate()
+        with trio.move_on_after(10):
+            await process.wait()
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+
+async def _read_devtools_url(stream) -> str:
+    output = b''
+    while True:
+        chunk = await stream.receive_some(4096)
+        if not chunk:
+            raise RuntimeError("Chrome завершился до открытия DevTools")
+        output += chunk
+        match = DEVTOOLS_URL_PATTERN.search(output)
+        if match:
+            return match.group(1).decode()
+
+
+async def _drain(stream):
+    while await stream.receive_some(65536):
+        pass
+
+
+@asynccontextmanager
+async def connect_cdp(ws_url: str):
+    async with open_websocket_url(ws_url, max_message_size=MAX_MESSAGE_SIZE) as websocket:
+        async with trio.open_nursery() as nursery:
+            connection = CdpConnection(websocket)
+            nursery.start_soon(connection.read_messages)
+            try:
+                yield connection
+            finally:
+                nursery.cancel_scope.cancel()
+
+
+@asynccontextmanager
+async def open_browser_connection(config: ParserConfig):
+    async with launch_browser(config) as ws_url:
+        async with connect_cdp(ws_url) as connection:
+            yield connection
+
+
+async def parse_ozon_reviews_async(product_url: str, config: ParserConfig = None,
+                                   connection: CdpConnection = None) -> Dict:
+    if config is None:
+        config = ParserConfig()
+
+    if connection is None:
+        async with open_browser_connection(config) as connection:
+            return await parse_ozon_reviews_async(product_url, config, connection)
+
+    page = CdpPage(connection, config)
+    start_time = datetime.now()
+    # у команд CDP нет своих таймаутов: зависшая вкладка иначе навсегда заняла бы слот лимитера
+    deadline = config.page_load_timeout + config.review_ready_timeout
+    try:
+        with trio.fail_after(deadline):
+            await page.open()
+            page.product_id = _extract_product_id(product_url)
+            await page.navigate(product_url)
+            await page.wait_for_reviews_ready()
+            reviews = await page.collect_reviews()
+    except trio.TooSlowError:
+        print(f"[CDP] Таймаут {deadline} с для {product_url}")
+        return {'error': f"таймаут {deadline} с", 'product_url': product_url, 'reviews': []}
+    except Exception as e:
+        print(f"[CDP] Ошибка для {product_url}: {e}")
+        return {'error': str(e), 'product_url': product_url, 'reviews': []}
+    finally:
+        with trio.CancelScope(shield=True) as scope:
+            scope.deadline = trio.current_time() + 10
+            if page.session_id:
+                await page.close()
+
+    result = build_result(product_url, page, reviews, start_time, datetime.now())
+    await trio.to_thread.run_sync(save_result, result, config)
+    print(f"[CDP] {product_url}: отзывов {len(reviews)}")
+    return result
+
+
+async def parse_multiple_products_async(product_urls: List[str], config: ParserConfig = None,
+                                        max_concurrency: int = None) -> List[Dict]:
+    if config is None:
+        config = ParserConfig()
+
+    limiter = trio.CapacityLimiter(max_concurrency or config.async_concurrency)
+    results = []
+
+    async def worker(url, connection):
+        async with limiter:
+            results.append(await parse_ozon_reviews_async(url, config, connection))
+
+    async with open_browser_connection(config) as connection:
+        async with trio.open_nursery() as nursery:
+            for url in product_urls:
+                nursery.start_soon(worker, url, connection)
+    return results
+
+
+def run_async_batch(product_urls: List[str], config: ParserConfig = None, max_concurrency: int = None) -> List[Dict]:
+    return trio.run(parse_multiple_products_async, product_urls, config, max_concurrency)
+
+
+def _extract_product_id(url: str) -> str:
+    if '/product/' in url:
+        parts = url.split('/product/')[1].split('-')
+        return parts[-1].split('/')[0].split('?')[0]
+    return ""
@@ -2,9 +2,11 @@ import os
 import csv
 import time
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from device_emulation import MOBILE_DEVICE_METRICS, MOBILE_USER_AGENT
+
 @dataclass
 class ImprovedParserConfig:
     headless: bool = False
@@ -40,6 +42,56 @@ class ParserConfig:
     author_selectors: List[str] = field(default=None)
     rating_selectors: List[str] = field(default=None)
     text_selectors: List[str] = field(default=None)
+    driver_pool_size: int = 1
+    chromedriver_path: str = None
+    driver_manifest: str = ".chromedriver.json"
+    offline_driver: bool = False
+    block_resources: bool = False
+    blocked_resource_types: List[str] = field(default=None)
+    block_third_party: bool = True
+    allowed_domains: List[str] = field(default=None)
+    recycle_after_pages: int = 200
+    recycle_after_seconds: int = 3600
+    recycle_rss_mb: int = 1500
+    profile_root: str = None
+    tabs_per_browser: int = 1
+    page_load_timeout: int = 30
+    page_load_strategy: str = "normal"
+    review_ready_timeout: int = 15
+    extraction_mode: str = "dom"
+    payloads_dir: str = None
+    network_log: bool = False
+    backend: str = "selenium"
+    api_base_url: str = "https://www.ozon.ru"
+    http_pool_size: int = 10
+    http_timeout: int = 15
+    http_delay_between_pages: float = 0.5
+    chrome_binary: str = None
+    async_concurrency: int = 20
+    launch_profile: str = "default"
+    dense_window_size: str = "800,600"
+    renderer_process_limit: int = 2
+    js_heap_mb: int = 512
+    debugger_address: Union[str, List[str]] = None
+    remote_endpoints: Union[str, List[Union[str, Dict]]] = None
+    remote_capacity: int = 4
+    crash_retries: int = 2
+    ssr_fast_path: bool = False
+    ssr_min_reviews: int = 1
+    device_mode: str = "desktop"
+    mobile_user_agent: str = MOBILE_USER_AGENT
+    mobile_device_metrics: Dict = field(default=None)
+    mobile_review_selectors: List[str] = field(default=None)
+    mobile_review_item_selectors: List[str] = field(default=None)
+    mobile_author_selectors: List[str] = field(default=None)
+    mobile_rating_selectors: List[str] = field(default=None)
+    mobile_text_selectors: List[str] = field(default=None)
+    disk_cache_dir: str = None
+    disk_cache_mb: int = 1024
+    hybrid_mode: bool = False
+    parse_processes: int = None
+    snapshots_dir: str = None
+    selector_stats_path: str = None
 
     def __post_init__(self):
         self.post_init()
@@ -76,29 +128,81 @@ class ParserConfig:
                 '.review-content',
                 '.comment-text'
             ]
+        if self.mobile_device_metrics is None:
+            self.mobile_device_metrics = dict(MOBILE_DEVICE_METRICS)
+        if self.mobile_review_selectors is None:
+            self.mobile_review_selectors = [
+                '[data-widget="webListReviews"]',
+                '[data-widget="webReviewsMobile"]',
+                '[data-widget="reviewsMobile"]',
+                '.m-reviews'
+            ]
+        if self.mobile_review_item_selectors is None:
+            self.mobile_review_item_selectors = [
+                'div[data-widget="webReviewCard"]',
+                '[data-widget="reviewCardMobile"]',
+                '.m-review'
+            ]
+        if self.mobile_author_selectors is None:
+            self.mobile_author_selectors = [
+                '[data-widget="webReviewAuthor"]',
+                '.m-review-author'
+            ]
+        if self.mobile_rating_selectors is None:
+            self.mobile_rating_selectors = [
+                '[data-widget="webRating"]',
+                '.m-review-rating'
+            ]
+        if self.mobile_text_selectors is None:
+            self.mobile_text_selectors = [
+                '[data-widget="webReviewText"]',
+                '.m-review-text'
+            ]
+        if self.blocked_resource_types is None:
+            self.blocked_resource_types = ['image', 'font', 'media']
+        if self.allowed_domains is None:
+            self.allowed_domains = ['ozon.ru', 'ozone.ru']
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(self.screenshots_dir, exist_ok=True)
 
-def parse_multiple_products(product_urls: List[str], config: ParserConfig = None, max_workers: int = 1):
+def parse_multiple_products(product_urls: List[str], config: ParserConfig = None, max_workers: int = 1, pool=None):
     if config is None:
         config = ParserConfig()
     
+    from driver_pool import DriverPool
+    from simple_runner import parse_ozon_reviews
+    from ssr_fast_path import fast_path_stats
+    from disk_cache import cache_stats
+
+    # отчёт в конце относится только к этому запуску
+    fast_path_stats.reset()
+    cache_stats.reset()
     results = []
 
-    if max_workers == 1:
+    if pool is None and config.backend == 'selenium':
+        with DriverPool(config, size=max(max_workers, config.driver_pool_size)) as pool:
+            if not config.ssr_fast_path:
+                pool.prewarm(min(pool.size, len(product_urls)))
+            return parse_multiple_products(product_urls, config, max_workers, pool)
+
+    if config.extraction_mode == 'offline':
+        from offline_parser import parse_multiple_products_offline
+        results = parse_multiple_products_offline(product_urls, config, max_workers, pool)
+    elif config.tabs_per_browser > 1:
+        from tab_scheduler import parse_with_tabs
+        results = parse_with_tabs(product_urls, config, pool, max_workers)
+    elif max_workers == 1:
         for i, url in enumerate(product_urls, 1):
             print(f"\n--- Парсинг товара {i}/{len(product_urls)} ---")
-            from simple_runner import parse_ozon_reviews
-            result = parse_ozon_reviews(url, config)
+            result = parse_ozon_reviews(url, config, pool=pool)
             results.append(result)
             if i < len(product_urls):
                 print("Пауза между товарами...")
                 time.sleep(30)
     else:
-        from simple_runner import parse_ozon_reviews
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_url = {
-                executor.submit(parse_ozon_reviews, url, config): url 
+                executor.submit(parse_ozon_reviews, url, config, pool): url 
                 for url in product_urls
             }
             for future in as_completed(future_to_url):
@@ -110,6 +214,22 @@ def parse_multiple_products(product_urls: List[str], config: ParserConfig = None
                 except Exception as e:
                     print(f"Ошибка для {url}: {e}")
                     results.append({'error': str(e), 'product_url': url, 'reviews': []})
+    if pool:
+        report = pool.launch_report()
+        print(f"Запущено браузеров: {report['browsers_launched']}, "
+              f"время запуска: {report['launch_seconds_total']:.1f} с (макс. {report['launch_seconds_max']:.1f} с), "
+              f"память на браузер: {report['rss_mb_avg']:.0f} МБ")
+        for endpoint in report.get('endpoints', []):
+            print(f"  {endpoint['url']}: сессий {endpoint['sessions_started']}, "
+                  f"занято {endpoint['in_use']}/{endpoint['capacity']}, ошибок {endpoint['failures']}")
+    if config.ssr_fast_path:
+        report = fast_path_stats.report()
+        print(f"Серверная разметка: {report['ssr_hits']}, через браузер: {report['browser_fallbacks']}, "
+              f"доля быстрого пути: {report['ssr_hit_rate']:.0%}")
+    if config.disk_cache_dir:
+        report = cache_stats.report()
+        print(f"Кэш ресурсов: попаданий {report['cache_hits']}, промахов {report['cache_misses']}, "
+              f"доля попаданий: {report['cache_hit_ratio']:.0%}, скачано {report['mb_downloaded']:.1f} МБ")
     return results
 
 def load_urls_from_csv(csv_file: str) -> List[str]:
@@ -120,3 +240,18 @@ def load_urls_from_csv(csv_file: str) -> List[str]:
             if row and row[0].startswith('http'):
                 urls.append(row[0])
     return urls
+
+def parse_products_from_csv(csv_file: str, config: ParserConfig = None, max_workers: int = 1):
+    if config is None:
+        config = ParserConfig()
+
+    from driver_pool import DriverPool
+
+    if config.backend != 'selenium':
+        return parse_multiple_products(load_urls_from_csv(csv_file), config, max_workers)
+
+    with DriverPool(config, size=max(max_workers, config.driver_pool_size)) as pool:
+        if not config.ssr_fast_path:
+            pool.prewarm()
+        product_urls = load_urls_from_csv(csv_file)
+        return parse_multiple_products(product_urls, config, max_workers, pool)
@@ -0,0 +1,33 @@
+from http.client import HTTPException
+
+from selenium.common.exceptions import InvalidSessionIdException, NoSuchWindowException, WebDriverException
+from urllib3.exceptions import HTTPError as Urllib3Error
+
+RENDERER_CRASH_MESSAGES = ['tab crashed', 'page crash', 'unable to receive message from renderer']
+BROWSER_CRASH_MESSAGES = [
+    'chrome not reachable',
+    'disconnected',
+    'session deleted',
+    'target window already closed',
+    'no such window',
+    'invalid session id',
+]
+
+
+def classify_crash(error: BaseException) -> str:
+    if isinstance(error, (ConnectionError, Urllib3Error, HTTPException)):
+        # chromedriver или удалённый узел не принимает соединения
+        return 'driver'
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return 'browser'
+    if isinstance(error, WebDriverException):
+        message = (error.msg or str(error)).lower()
+        if any(text in message for text in RENDERER_CRASH_MESSAGES):
+            return 'renderer'
+        if any(text in message for text in BROWSER_CRASH_MESSAGES):
+            return 'browser'
+    return ''
+
+
+def is_crash(error: BaseException) -> bool:
+    return bool(classify_crash(error))
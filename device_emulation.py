@@ -0,0 +1,36 @@
+from typing import Dict, List, Tuple
+
+MOBILE_USER_AGENT = (
+    "Mozilla/5.0 (Linux; Android 13; Pixel 7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36"
+)
+
+MOBILE_DEVICE_METRICS = {
+    'width': 412,
+    'height': 915,
+    'deviceScaleFactor': 2.625,
+    'mobile': True,
+}
+
+
+def is_mobile(config) -> bool:
+    return bool(config) and config.device_mode == 'mobile'
+
+
+def emulation_commands(config) -> List[Tuple[str, Dict]]:
+    if not is_mobile(config):
+        return []
+    return [
+        ('Emulation.setDeviceMetricsOverride', dict(config.mobile_device_metrics)),
+        ('Emulation.setTouchEmulationEnabled', {'enabled': True, 'maxTouchPoints': 5}),
+        ('Network.setUserAgentOverride', {
+            'userAgent': config.mobile_user_agent,
+            'platform': 'Android',
+        }),
+    ]
+
+
+def apply_device_emulation(driver, config):
+    # переопределения CDP действуют на вкладку, поэтому применяются к каждой новой
+    for method, params in emulation_commands(config):
+        driver.execute_cdp_cmd(method, params)
@@ -0,0 +1,124 @@
+import os
+import shutil
+import threading
+from typing import Dict, List
+
+from profiles import LOCK_FILE, profile_allocator
+
+CACHE_STATS_SCRIPT = """
+let hits = 0, misses = 0, bytes = 0;
+for (const entry of performance.getEntriesByType('resource')) {
+    if (!entry.decodedBodySize) {
+        // сторонние ресурсы без Timing-Allow-Origin не сообщают размеры
+        continue;
+    }
+    if (entry.transferSize === 0) {
+        hits += 1;
+    } else {
+        misses += 1;
+        bytes += entry.transferSize;
+    }
+}
+return {hits: hits, misses: misses, bytes: bytes};
+"""
+
+
+class CacheStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_downloaded = 0
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.bytes_downloaded = 0
+
+    def record(self, metrics: Dict):
+        with self._lock:
+            self.hits += metrics.get('hits', 0)
+            self.misses += metrics.get('misses', 0)
+            self.bytes_downloaded += metrics.get('bytes', 0)
+
+    def report(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'cache_hit_ratio': self.hits / total if total else 0.0,
+                'mb_downloaded': self.bytes_downloaded / 1024 / 1024,
+            }
+
+
+cache_stats = CacheStats()
+
+
+def uses_disk_cache(config) -> bool:
+    return bool(config) and bool(config.disk_cache_dir)
+
+
+def acquire_cache_dir(config) -> str:
+    # один каталог кэша на работающий Chrome: дисковый кэш не рассчитан на несколько процессов
+    return profile_allocator(config.disk_cache_dir).acquire()
+
+
+def release_cache_dir(config, path: str):
+    profile_allocator(config.disk_cache_dir).release(path)
+    evict_cache(config.disk_cache_dir, config.disk_cache_mb * 1024 * 1024)
+
+
+def cache_launch_args(config, cache_dir: str, slots: int = 1) -> List[str]:
+    # evict_cache не трогает каталоги работающих браузеров, поэтому общий лимит делится между ними
+    slot_bytes = config.disk_cache_mb * 1024 * 1024 // max(1, slots)
+    return [f'--disk-cache-dir={cache_dir}', f'--disk-cache-size={slot_bytes}']
+
+
+def evict_cache(root: str, max_bytes: int) -> int:
+    slots = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isdir(path):
+            slots.append((_last_used(path), _dir_size(path), path))
+
+    total = sum(size for _, size, _ in slots)
+    freed = 0
+    for _, size, path in sorted(slots):
+        if total - freed <= max_bytes:
+            break
+        if os.path.exists(os.path.join(path, LOCK_FILE)):
+            # каталог занят работающим браузером
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        freed += size
+    return freed
+
+
+def record_cache_stats(backend):
+    try:
+        metrics = backend.execute_script(CACHE_STATS_SCRIPT)
+    except Exception:
+        return
+    if metrics:
+        cache_stats.record(metrics)
+
+
+def _dir_size(path: str) -> int:
+    size = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                size += os.path.getsize(os.path.join(directory, name))
+            except OSError:
+                pass
+    return size
+
+
+def _last_used(path: str) -> float:
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0.0
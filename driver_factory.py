@@ -0,0 +1,180 @@
+import shutil
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+
+from device_emulation import apply_device_emulation
+from disk_cache import acquire_cache_dir, cache_launch_args, release_cache_dir, uses_disk_cache
+from driver_resolver import forget_chromedriver, resolve_chromedriver
+from remote_endpoints import RemoteChrome
+from resource_blocking import add_blocking_prefs, apply_resource_blocking
+
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+DENSE_LAUNCH_ARGS = [
+    '--disable-extensions',
+    '--disable-gpu',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--disable-translate',
+    '--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication',
+    '--disable-client-side-phishing-detection',
+    '--disable-domain-reliability',
+    '--metrics-recording-only',
+    '--mute-audio',
+    '--no-first-run',
+    '--no-default-browser-check',
+]
+
+
+def build_chrome_options(config=None, profile_dir: str = None) -> Options:
+    chrome_options = Options()
+
+    if profile_dir:
+        chrome_options.add_argument(f'--user-data-dir={profile_dir}')
+
+    if config:
+        if config.headless:
+            chrome_options.add_argument('--headless')
+
+        dense = config.launch_profile == 'dense'
+        window_size = (config.dense_window_size if dense else config.window_size).split(',')
+        chrome_options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
+
+        if config.user_agent:
+            chrome_options.add_argument(f'--user-agent={config.user_agent}')
+
+        if dense:
+            for argument in DENSE_LAUNCH_ARGS:
+                chrome_options.add_argument(argument)
+            chrome_options.add_argument(f'--renderer-process-limit={config.renderer_process_limit}')
+            chrome_options.add_argument(f'--js-flags=--max-old-space-size={config.js_heap_mb}')
+    else:
+        chrome_options.add_argument('--window-size=1920,1080')
+
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument('--disable-web-security')
+    chrome_options.add_argument('--allow-running-insecure-content')
+
+    if config and config.block_resources:
+        add_blocking_prefs(chrome_options, config)
+
+    if config and (config.extraction_mode == 'network' or config.network_log):
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    if config:
+        chrome_options.page_load_strategy = config.page_load_strategy
+        if config.tabs_per_browser > 1:
+            # вкладки опрашиваются по очереди, команды не должны ждать загрузки страницы
+            chrome_options.page_load_strategy = 'none'
+
+    return chrome_options
+
+
+def build_attach_options(config, debugger_address: str) -> Options:
+    # при подключении к запущенному Chrome аргументы запуска и excludeSwitches недопустимы
+    chrome_options = Options()
+    chrome_options.debugger_address = debugger_address
+    chrome_options.page_load_strategy = config.page_load_strategy
+    if config.tabs_per_browser > 1:
+        chrome_options.page_load_strategy = 'none'
+    if config.extraction_mode == 'network' or config.network_log:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return chrome_options
+
+
+def create_driver(config=None, profile_dir: str = None, debugger_address: str = None, endpoint=None,
+                  cache_slots: int = 1):
+    if debugger_address:
+        chrome_options = build_attach_options(config, debugger_address)
+    else:
+        chrome_options = build_chrome_options(config, profile_dir)
+
+    cache_dir = None
+    if endpoint:
+        driver = RemoteChrome(command_executor=endpoint.connection, options=chrome_options)
+    else:
+        if not debugger_address and uses_disk_cache(config):
+            cache_dir = acquire_cache_dir(config)
+            for argument in cache_launch_args(config, cache_dir, cache_slots):
+                chrome_options.add_argument(argument)
+        try:
+            driver = _start_chrome(config, chrome_options)
+        except Exception:
+            if cache_dir:
+                release_cache_dir(config, cache_dir)
+            raise
+    driver.debugger_address = debugger_address
+    driver.remote_endpoint = endpoint
+    driver.cache_dir = cache_dir
+    driver.parser_config = config
+
+    prepare_tab(driver, config)
+
+    if not (debugger_address or (config and (config.headless or config.launch_profile == 'dense'))):
+        driver.maximize_window()
+
+    return driver
+
+
+def _start_chrome(config, chrome_options):
+    try:
+        return webdriver.Chrome(service=Service(resolve_chromedriver(config)), options=chrome_options)
+    except SessionNotCreatedException:
+        if config and (config.chromedriver_path or config.offline_driver):
+            raise
+    # закреплённый драйвер не подходит к обновившемуся Chrome: подбираем заново один раз
+    forget_chromedriver(config)
+    return webdriver.Chrome(service=Service(resolve_chromedriver(config)), options=chrome_options)
+
+
+def close_driver(driver):
+    if getattr(driver, 'debugger_address', None):
+        # браузер запущен не нами: отключаемся, не закрывая его
+        driver.service.stop()
+        return
+    try:
+        driver.quit()
+    finally:
+        if getattr(driver, 'http_session', None):
+            driver.http_session.close()
+        if getattr(driver, 'cache_dir', None):
+            release_cache_dir(driver.parser_config, driver.cache_dir)
+
+
+def debugger_addresses(config) -> list:
+    if not (config and config.debugger_address):
+        return []
+    if isinstance(config.debugger_address, str):
+        return [address.strip() for address in config.debugger_address.split(',') if address.strip()]
+    return list(config.debugger_address)
+
+
+def find_chrome_binary(config=None) -> str:
+    if config and config.chrome_binary:
+        return config.chrome_binary
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    raise RuntimeError("Chrome не найден: укажите chrome_binary в ParserConfig")
+
+
+def prepare_tab(driver, config=None):
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    if config and config.block_resources:
+        apply_resource_blocking(driver, config)
+
+    apply_device_emulation(driver, config)
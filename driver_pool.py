@@ -0,0 +1,283 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from driver_factory import close_driver, create_driver, debugger_addresses
+from process_memory import driver_rss_bytes
+from profiles import profile_allocator
+from remote_endpoints import endpoint_scheduler
+
+
+@dataclass
+class DriverStats:
+    created_at: float = field(default_factory=time.monotonic)
+    pages_served: int = 0
+    leases: int = 0
+    rss_bytes: int = 0
+    profile_dir: str = None
+    debugger_address: str = None
+    endpoint: object = None
+
+    @property
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class DriverPool:
+
+    def __init__(self, config=None, size: int = None):
+        self.config = config
+        self.size = max(1, size or (config.driver_pool_size if config else 1))
+        self.addresses = debugger_addresses(config)
+        if self.addresses:
+            # к одному браузеру подключается не больше одного воркера
+            self.size = min(self.size, len(self.addresses))
+        self.scheduler = endpoint_scheduler(config)
+        if self.scheduler:
+            self.size = min(self.size, self.scheduler.capacity)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self._stats = {}
+        self._connecting = set()
+        self.launch_times = []
+        self.recycled = 0
+
+    def acquire(self, timeout: float = None):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._launch_or_wait(timeout)
+
+            if self._is_healthy(driver):
+                with self._lock:
+                    if driver in self._stats:
+                        self._stats[driver].leases += 1
+                return driver
+
+            print("[POOL] Браузер не отвечает, заменяем")
+            self._discard(driver, failed=True)
+
+    def prewarm(self, count: int = None) -> List[threading.Thread]:
+        count = self.size if count is None else count
+        threads = []
+        with self._lock:
+            count = min(count, self.size - self._created)
+            self._created += max(count, 0)
+        for i in range(count):
+            thread = threading.Thread(target=self._prewarm_one, name=f"prewarm-{i}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def launch_report(self) -> Dict:
+        with self._lock:
+            launch_times = list(self.launch_times)
+            drivers = list(self._stats)
+        rss_mb = [driver_rss_bytes(driver) / 1024 / 1024 for driver in drivers]
+        report = {
+            'browsers_launched': len(launch_times),
+            'launch_seconds_total': sum(launch_times),
+            'launch_seconds_max': max(launch_times, default=0),
+            'browsers_recycled': self.recycled,
+            'rss_mb_per_browser': rss_mb,
+            'rss_mb_avg': sum(rss_mb) / len(rss_mb) if rss_mb else 0,
+        }
+        if self.scheduler:
+            report['endpoints'] = self.scheduler.report()
+        return report
+
+    def record_page(self, driver):
+        with self._lock:
+            if driver in self._stats:
+                self._stats[driver].pages_served += 1
+
+    def stats(self, driver) -> DriverStats:
+        with self._lock:
+            return self._stats.get(driver)
+
+    def release(self, driver):
+        if driver is None:
+            return
+        if self._closed:
+            self._discard(driver)
+            return
+        reason = self._recycle_reason(driver)
+        if reason:
+            print(f"[POOL] Перезапускаем браузер: {reason}")
+            self._discard(driver)
+            self.recycled += 1
+            self._replace_in_background()
+            return
+        try:
+            self._reset(driver)
+        except Exception as e:
+            print(f"[POOL] Не удалось сбросить состояние браузера: {e}")
+            self._discard(driver, failed=True)
+            return
+        self._idle.put(driver)
+
+    def discard(self, driver, failed: bool = True):
+        # снаружи браузер выбрасывают после сбоя: это засчитывается удалённому узлу как ошибка
+        if driver is not None:
+            self._discard(driver, failed)
+
+    @contextmanager
+    def lease(self, timeout: float = None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            drivers = list(self._stats)
+        for driver in drivers:
+            self._discard(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _launch_or_wait(self, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Пул браузеров закрыт")
+                can_launch = self._created < self.size
+                if can_launch:
+                    self._created += 1
+            if can_launch:
+                break
+
+            wait = 1.0
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    raise TimeoutError("Нет свободных браузеров в пуле")
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+        return self._launch()
+
+    def _launch(self):
+        started = time.monotonic()
+        profile_dir = None
+        address = None
+        endpoint = None
+        try:
+            if self.addresses:
+                address = self._free_address()
+            elif self.scheduler:
+                endpoint = self.scheduler.acquire()
+            elif self.config and self.config.profile_root:
+                profile_dir = profile_allocator(self.config.profile_root).acquire()
+            driver = create_driver(self.config, profile_dir, address, endpoint, cache_slots=self.size)
+        except Exception:
+            if profile_dir:
+                profile_allocator(self.config.profile_root).release(profile_dir)
+            if endpoint:
+                self.scheduler.release(endpoint, failed=True)
+            with self._lock:
+                self._created -= 1
+                self._connecting.discard(address)
+            raise
+
+        with self._lock:
+            self._connecting.discard(address)
+            self.launch_times.append(time.monotonic() - started)
+            self._stats[driver] = DriverStats(
+                profile_dir=profile_dir, debugger_address=address, endpoint=endpoint
+            )
+            closed = self._closed
+        if closed:
+            self._discard(driver)
+            raise RuntimeError("Пул браузеров закрыт")
+        return driver
+
+    def _prewarm_one(self):
+        try:
+            driver = self._launch()
+        except Exception as e:
+            print(f"[POOL] Не удалось запустить браузер: {e}")
+            return
+        self._idle.put(driver)
+
+    def _free_address(self) -> str:
+        with self._lock:
+            used = {stats.debugger_address for stats in self._stats.values()}
+            for address in self.addresses:
+                if address not in used and address not in self._connecting:
+                    self._connecting.add(address)
+                    return address
+        raise RuntimeError("Нет свободных адресов отладки Chrome")
+
+    def _replace_in_background(self):
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return
+            self._created += 1
+        threading.Thread(target=self._prewarm_one, name="recycle", daemon=True).start()
+
+    def _recycle_reason(self, driver) -> str:
+        stats = self.stats(driver)
+        if stats is None or self.config is None:
+            return ""
+
+        if self.config.recycle_after_pages and stats.pages_served >= self.config.recycle_after_pages:
+            return f"обслужено страниц: {stats.pages_served}"
+        if self.config.recycle_after_seconds and stats.age_seconds >= self.config.recycle_after_seconds:
+            return f"время жизни: {stats.age_seconds:.0f} с"
+        if self.config.recycle_rss_mb:
+            stats.rss_bytes = driver_rss_bytes(driver)
+            if stats.rss_bytes >= self.config.recycle_rss_mb * 1024 * 1024:
+                return f"память: {stats.rss_bytes / 1024 / 1024:.0f} МБ"
+        return ""
+
+    def _is_healthy(self, driver) -> bool:
+        try:
+            driver.window_handles
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        if not (self.config and self.config.profile_root):
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass
+            driver.delete_all_cookies()
+        driver.get("about:blank")
+
+    def _discard(self, driver, failed: bool = False):
+        with self._lock:
+            stats = self._stats.pop(driver, None)
+            if stats is not None:
+                self._created -= 1
+        try:
+            close_driver(driver)
+        except Exception:
+            pass
+        if stats is not None and stats.profile_dir:
+            profile_allocator(self.config.profile_root).release(stats.profile_dir)
+        if stats is not None and stats.endpoint:
+            self.scheduler.release(stats.endpoint, failed=failed)
@@ -0,0 +1,156 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+_lock = threading.Lock()
+_resolved = {}
+_browser_versions = {}
+
+VERSION_PATTERN = re.compile(r'(\d+)\.\d+\.\d+')
+
+
+def resolve_chromedriver(config=None) -> str:
+    manifest_path = config.driver_manifest if config else ".chromedriver.json"
+    offline = bool(config and config.offline_driver)
+    explicit = config.chromedriver_path if config else None
+    chrome_major = browser_major_version(config)
+    # после автообновления Chrome закреплённый драйвер перестаёт подходить, поэтому версия входит в ключ
+    key = (manifest_path, explicit, chrome_major)
+
+    path = _resolved.get(key)
+    if path and os.path.isfile(path):
+        return path
+
+    with _lock:
+        path = _resolved.get(key)
+        if path and os.path.isfile(path):
+            return path
+
+        path = (
+            explicit
+            or _read_manifest(manifest_path, chrome_major)
+            or _which_chromedriver(chrome_major)
+        )
+
+        if not path:
+            if offline:
+                raise RuntimeError(
+                    f"chromedriver для Chrome {chrome_major or '?'} не найден: "
+                    f"укажите chromedriver_path или манифест для офлайн-режима"
+                )
+            with _file_lock(manifest_path + ".lock"):
+                path = _read_manifest(manifest_path, chrome_major) or _download_chromedriver()
+
+        if not os.path.isfile(path):
+            raise RuntimeError(f"chromedriver не найден по пути: {path}")
+
+        if not explicit:
+            _write_manifest(manifest_path, path, chrome_major)
+        _resolved[key] = path
+        return path
+
+
+def forget_chromedriver(config=None):
+    # вызывается при SessionNotCreated: следующий resolve_chromedriver подберёт драйвер заново
+    manifest_path = config.driver_manifest if config else ".chromedriver.json"
+    with _lock:
+        _browser_versions.clear()
+        for key in [key for key in _resolved if key[0] == manifest_path]:
+            del _resolved[key]
+        try:
+            os.remove(manifest_path)
+        except OSError:
+            pass
+
+
+def browser_major_version(config=None) -> str:
+    from driver_factory import find_chrome_binary
+
+    try:
+        binary = find_chrome_binary(config)
+    except RuntimeError:
+        return ""
+    if binary not in _browser_versions:
+        _browser_versions[binary] = _major_version(binary)
+    return _browser_versions[binary]
+
+
+def _major_version(binary: str) -> str:
+    try:
+        output = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=30).stdout
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    match = VERSION_PATTERN.search(output)
+    return match.group(1) if match else ""
+
+
+def _which_chromedriver(chrome_major: str) -> str:
+    path = shutil.which("chromedriver")
+    if path and chrome_major and _major_version(path) not in ("", chrome_major):
+        return ""
+    return path or ""
+
+
+def _download_chromedriver() -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
+
+
+def _read_manifest(manifest_path: str, chrome_major: str = "") -> str:
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return ""
+    path = manifest.get('chromedriver')
+    if chrome_major and manifest.get('chrome_major') != chrome_major:
+        return ""
+    return path if path and os.path.isfile(path) else ""
+
+
+def _write_manifest(manifest_path: str, path: str, chrome_major: str = ""):
+    if _read_manifest(manifest_path, chrome_major) == path:
+        return
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    manifest = {'chromedriver': path, 'chrome_major': chrome_major, 'resolved_at': datetime.now().isoformat()}
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+class _file_lock:
+
+    def __init__(self, path: str, timeout: float = 120, stale_after: float = 600):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+
+    def __enter__(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                return self
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                        os.remove(self.path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Не удалось получить блокировку {self.path}")
+                time.sleep(0.2)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
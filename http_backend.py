@@ -0,0 +1,143 @@
+import os
+import re
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from review_json import dedupe_reviews, extract_reviews_from_payload
+
+PAGE_JSON_PATH = '/api/entrypoint-api.bx/page/json/v2'
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+class HttpBackendError(Exception):
+    pass
+
+
+def create_session(config) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=config.http_pool_size,
+        pool_maxsize=config.http_pool_size,
+        max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({
+        'User-Agent': config.user_agent,
+        'Accept': 'application/json, text/plain, */*',
+        'Accept-Encoding': 'gzip, deflate',
+        'Accept-Language': 'ru-RU,ru;q=0.9',
+        'Connection': 'keep-alive',
+    })
+    return session
+
+
+def shared_session(config) -> requests.Session:
+    key = (config.api_base_url, config.http_pool_size, config.user_agent)
+    with _sessions_lock:
+        if key not in _sessions:
+            _sessions[key] = create_session(config)
+        return _sessions[key]
+
+
+def payload_filename(path: str) -> str:
+    return re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_')[:150] + '.json'
+
+
+def product_path(product_url: str) -> str:
+    path = urlsplit(product_url).path
+    return path if path.endswith('/') else path + '/'
+
+
+class OzonHttpReviewsParser:
+
+    def __init__(self, config, session: requests.Session = None):
+        self.config = config
+        self.session = session or shared_session(config)
+        self.driver = None
+        self.reviews = []
+        self.product_id = None
+        self.browser_wait_seconds = 0.0
+        self.browser_rss_bytes = 0
+        self.requests_made = 0
+        self.debug = True
+
+    def _debug_print(self, message):
+        if self.debug:
+            print(f"[DEBUG] {message}")
+
+    def parse_product_reviews(self, product_url: str) -> List[Dict]:
+        self.reviews = []
+        self.product_id = self._extract_product_id(product_url)
+
+        try:
+            self.reviews = self.fetch_reviews(product_path(product_url) + 'reviews/')
+        except HttpBackendError as e:
+            self._debug_print(f"Ошибка HTTP при получении отзывов: {e}")
+        return self.reviews
+
+    def fetch_reviews(self, reviews_path: str, first_page: int = 1) -> List[Dict]:
+        reviews = []
+        path = reviews_path if first_page == 1 else f"{reviews_path}?page={first_page}"
+
+        for page in range(first_page, self.config.max_pages + 1):
+            try:
+                payload = self.fetch_page_json(path)
+            except HttpBackendError as e:
+                if not reviews:
+                    raise
+                # уже полученные страницы не выбрасываем, просто прекращаем листать
+                self._debug_print(f"Страница {page} не загружена, останавливаемся: {e}")
+                break
+            page_reviews = extract_reviews_from_payload(payload)
+            known = len(reviews)
+            reviews = dedupe_reviews(reviews + page_reviews)
+            self._debug_print(f"Страница {page}: {len(page_reviews)} отзывов")
+
+            path = payload.get('nextPage') if isinstance(payload, dict) else None
+            if not path or len(reviews) == known:
+                break
+            time.sleep(self.config.http_delay_between_pages)
+        return reviews
+
+    def fetch_page_json(self, path: str) -> Dict:
+        url = self.config.api_base_url.rstrip('/') + PAGE_JSON_PATH
+        try:
+            response = self.session.get(url, params={'url': path}, timeout=self.config.http_timeout)
+        except requests.RequestException as e:
+            raise HttpBackendError(str(e)) from e
+        self.requests_made += 1
+
+        if response.status_code != 200:
+            raise HttpBackendError(f"HTTP {response.status_code} для {path}")
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise HttpBackendError(f"Ответ не JSON для {path}") from e
+
+        self._record(path, response.text)
+        return payload
+
+    def _record(self, path: str, body: str):
+        if not self.config.payloads_dir:
+            return
+        os.makedirs(self.config.payloads_dir, exist_ok=True)
+        with open(os.path.join(self.config.payloads_dir, payload_filename(path)), 'w', encoding='utf-8') as f:
+            f.write(body)
+
+    def _extract_product_id(self, url: str) -> str:
+        if '/product/' in url:
+            parts = url.split('/product/')[1].split('-')
+            return parts[-1].split('/')[0].split('?')[0]
+        return ""
+
+    def save_screenshot(self, filename: str):
+        pass
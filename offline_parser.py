@@ -0,0 +1,129 @@
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+from backends import SoupBackend
+from config import ParserConfig
+from ozon_reviews_parser import OzonReviewsParserImproved
+
+SNAPSHOT_URL_PATTERN = re.compile(r'^<!-- url: (\S*) -->\n')
+SNAPSHOT_NAME_PATTERN = re.compile(r'^(.+)__(\d+)\.html$')
+
+
+def extract_reviews_from_snapshots(snapshots: List[Tuple[str, str]], config: ParserConfig = None) -> List[Dict]:
+    parser = OzonReviewsParserImproved(config)
+    parser.debug = False
+    if not snapshots:
+        return []
+
+    *product_pages, (last_url, last_html) = snapshots
+    for url, html in product_pages:
+        # на странице товара учитываются только карточки отзывов, без поиска по всем div
+        parser.backend = SoupBackend(html, url)
+        parser.reviews = []
+        if parser._find_reviews_on_product_page():
+            return parser.reviews
+    return parser.parse_with_backend(SoupBackend(last_html, last_url), last_url)
+
+
+def save_snapshots(snapshots: List[Tuple[str, str]], directory: str, product_id: str) -> List[str]:
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for index, (url, html) in enumerate(snapshots):
+        path = os.path.join(directory, f"{product_id or 'unknown'}__{index}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f"<!-- url: {url} -->\n")
+            f.write(html)
+        paths.append(path)
+    return paths
+
+
+def load_snapshots(paths: List[str]) -> Dict[str, List[Tuple[str, str]]]:
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in os.listdir(path))
+        else:
+            files.append(path)
+
+    groups = {}
+    for path in sorted(files):
+        match = SNAPSHOT_NAME_PATTERN.match(os.path.basename(path))
+        if not match:
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            html = f.read()
+        url_match = SNAPSHOT_URL_PATTERN.match(html)
+        url = url_match.group(1) if url_match else ''
+        groups.setdefault(match.group(1), []).append((int(match.group(2)), url, html))
+
+    return {
+        product_id: [(url, html) for _, url, html in sorted(pages)]
+        for product_id, pages in groups.items()
+    }
+
+
+def reparse_snapshots(paths: List[str], config: ParserConfig = None,
+                      max_workers: int = None) -> Dict[str, List[Dict]]:
+    groups = load_snapshots(paths)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            product_id: executor.submit(extract_reviews_from_snapshots, snapshots, config)
+            for product_id, snapshots in groups.items()
+        }
+        return {product_id: future.result() for product_id, future in futures.items()}
+
+
+def parse_multiple_products_offline(product_urls: List[str], config: ParserConfig, max_workers: int = 1,
+                                    pool=None) -> List[Dict]:
+    from simple_runner import build_result, save_result
+
+    def capture(url):
+        parser = OzonReviewsParserImproved(config=config, pool=pool)
+        start_time = datetime.now()
+        snapshots = parser.capture_snapshots(url)
+        if config.snapshots_dir:
+            save_snapshots(snapshots, config.snapshots_dir, parser.product_id)
+        # браузер уже свободен: разбор идёт в процессах, пока воркер открывает следующий товар
+        return parser, start_time, parsers.submit(extract_reviews_from_snapshots, snapshots, config)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=config.parse_processes) as parsers:
+        with ThreadPoolExecutor(max_workers=max_workers) as browsers:
+            captures = {browsers.submit(capture, url): url for url in product_urls}
+            pending = []
+            for future in as_completed(captures):
+                url = captures[future]
+                try:
+                    pending.append((url,) + future.result())
+                except Exception as e:
+                    print(f"Ошибка для {url}: {e}")
+                    results.append({'error': str(e), 'product_url': url, 'reviews': []})
+
+        for url, parser, start_time, parse_future in pending:
+            try:
+                reviews = parse_future.result()
+            except Exception as e:
+                print(f"Ошибка разбора для {url}: {e}")
+                results.append({'error': str(e), 'product_url': url, 'reviews': []})
+                continue
+            result = build_result(url, parser, reviews, start_time, datetime.now())
+            filename = save_result(result, config)
+            print(f"Завершен парсинг: {url}, отзывов: {len(reviews)}, файл: {filename}")
+            results.append(result)
+    return results
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(1)
+
+    for product_id, reviews in reparse_snapshots(sys.argv[1:]).items():
+        print(f"{product_id}: отзывов {len(reviews)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,96 +1,401 @@
 import json
+import os
 import time
 import random
-from typing import List, Dict, Optional
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from typing import List, Dict, Optional, Tuple
 
+from backends import SeleniumBackend
+from crash_recovery import classify_crash, is_crash
+from device_emulation import is_mobile
+from disk_cache import record_cache_stats, uses_disk_cache
+from driver_factory import close_driver, create_driver, debugger_addresses
+from http_backend import HttpBackendError, OzonHttpReviewsParser, create_session, product_path
+from page_scripts import READY_SELECTORS, REVIEW_CARDS_SCRIPT, REVIEWS_READY_SCRIPT, WIDGET_STATES_SCRIPT
+from process_memory import driver_rss_bytes
+from profiles import consent_done, mark_consent_done, profile_allocator
+from remote_endpoints import endpoint_scheduler
+from review_blocks import block_params
+from review_json import (
+    extract_reviews_from_payload, extract_reviews_from_widget_state, dedupe_reviews, is_review_payload_url
+)
+from selector_stats import selector_stats
+from text_selectors import compile_selector
+
+REVIEW_ITEM_SELECTORS = [
+    'div[data-widget="webReviewCard"]',
+    '.review-item',
+    '.review-card',
+    '[data-testid="review"]',
+    '.review',
+    'div:has(.review-text)',
+    'div:has([data-widget="webReviewText"])'
+]
+
+AUTHOR_SELECTORS = [
+    '.review-author', '.author', '[data-widget="webReviewAuthor"]',
+    '.user-name', '.reviewer-name', '.review-user',
+    'span:contains("пользователь")', 'div:contains("@")'
+]
+
+TEXT_SELECTORS = [
+    '.review-text', '[data-widget="webReviewText"]',
+    '.review-content', '.comment-text', '.review-body'
+]
+
+DATE_SELECTORS = [
+    '.review-date', '.date', '[data-widget="webReviewDate"]',
+    'time', '.review-time'
+]
+
+RATING_SELECTORS = [
+    '[data-widget="webRating"]',
+    '.rating', '.stars', '.review-rating'
+]
+
+FILLED_STAR_SELECTOR = '[data-index]:not([data-state="empty"])'
+
+REVIEW_ID_ATTRIBUTES = ['data-review-uuid', 'data-review-id']
 
 class OzonReviewsParserImproved:
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, pool=None, backend=None):
         self.config = config
+        self.pool = pool
         self.driver = None
+        self.backend = backend
         self.reviews = []
         self.product_id = None
+        self.browser_wait_seconds = 0.0
+        self.browser_rss_bytes = 0
+        self.profile_dir = None
+        self.endpoint = None
+        self.completed_steps = {}
+        self.readiness = {}
+        self.resume_url = None
+        self.crash_restarts = 0
+        self.served_by = None
+        self.http_requests = 0
+        self.selector_stats = None
+        if config and config.selector_stats_path:
+            self.selector_stats = selector_stats(config.selector_stats_path)
         self.debug = True
         
     def _setup_driver(self):
-        chrome_options = Options()
-        
-        if self.config:
-            if self.config.headless:
-                chrome_options.add_argument('--headless')
-            
-            window_size = self.config.window_size.split(',')
-            chrome_options.add_argument(f'--window-size={window_size[0]},{window_size[1]}')
-            
-            if self.config.user_agent:
-                chrome_options.add_argument(f'--user-agent={self.config.user_agent}')
-        else:
-            chrome_options.add_argument('--window-size=1920,1080')
-        
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument('--disable-web-security')
-        chrome_options.add_argument('--allow-running-insecure-content')
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        if not (self.config and self.config.headless):
-            self.driver.maximize_window()
+        addresses = debugger_addresses(self.config)
+        if addresses:
+            self.attach_driver(create_driver(self.config, debugger_address=addresses[0]))
+            return
+        scheduler = endpoint_scheduler(self.config)
+        if scheduler:
+            self.endpoint = scheduler.acquire()
+            try:
+                self.attach_driver(create_driver(self.config, endpoint=self.endpoint))
+            except Exception:
+                scheduler.release(self.endpoint, failed=True)
+                self.endpoint = None
+                raise
+            return
+        if self.config and self.config.profile_root:
+            self.profile_dir = profile_allocator(self.config.profile_root).acquire()
+        self.attach_driver(create_driver(self.config, self.profile_dir))
+    
+    def attach_driver(self, driver):
+        self.driver = driver
+        self.backend = SeleniumBackend(driver) if driver else None
     
     def _debug_print(self, message):
         if self.debug:
             print(f"[DEBUG] {message}")
     
     def _save_debug_html(self, filename="debug.html"):
-        if self.driver:
+        if self.backend and self.backend.live:
             with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.driver.page_source)
+                f.write(self.backend.page_source())
             self._debug_print(f"HTML сохранен в {filename}")
     
     def parse_product_reviews(self, product_url: str) -> List[Dict]:
+        self._start_product(product_url)
         try:
-            self._setup_driver()
-            self.reviews = []
-            self.product_id = self._extract_product_id(product_url)
+            wait_started = time.monotonic()
+            self._acquire_driver()
+            self.browser_wait_seconds = time.monotonic() - wait_started
             
-            self._debug_print(f"Открываем страницу: {product_url}")
-            self.driver.get(product_url)
-            self._handle_initial_page()
+            while True:
+                try:
+                    self._drain_network_log()
+                    self._debug_print(f"Открываем страницу: {self.resume_url}")
+                    self._open_url(self.resume_url)
+                    return self.parse_loaded_page()
+                except Exception as e:
+                    if not self._recover_from_crash(e):
+                        raise
             
-            self._save_debug_html("product_page.html")
+        except Exception as e:
+            self._debug_print(f"Ошибка при парсинге отзывов: {e}")
+            if not is_crash(e):
+                self.save_screenshot("error_screenshot.png")
+                self._save_debug_html("error_page.html")
+            return self.reviews
+        finally:
+            if self.driver:
+                self.browser_rss_bytes = driver_rss_bytes(self.driver)
+            self._release_driver()
+            self._save_selector_stats()
+    
+    def capture_snapshots(self, product_url: str) -> List[Tuple[str, str]]:
+        # браузер только отдаёт HTML, разбор выполняется отдельно (см. offline_parser)
+        self._start_product(product_url)
+        snapshots = []
+        try:
+            wait_started = time.monotonic()
+            self._acquire_driver()
+            self.browser_wait_seconds = time.monotonic() - wait_started
             
-            reviews_found = self._find_reviews_on_product_page()
+            self._open_url(product_url)
+            self._handle_initial_page()
+            snapshots.append((self.backend.current_url, self.backend.page_source()))
             
-            if not reviews_found:
+            item_selectors = self._with_mobile_selectors('review_item', REVIEW_ITEM_SELECTORS)
+            if not self.backend.execute_script(REVIEWS_READY_SCRIPT, item_selectors):
                 self._navigate_to_reviews()
-                self._save_debug_html("reviews_page.html")
-                self._parse_all_reviews()
-            
-            return self.reviews
-            
+                snapshots.append((self.backend.current_url, self.backend.page_source()))
         except Exception as e:
-            self._debug_print(f"Ошибка при парсинге отзывов: {e}")
-            self.save_screenshot("error_screenshot.png")
-            self._save_debug_html("error_page.html")
-            return []
+            self._debug_print(f"Ошибка при сохранении HTML: {e}")
         finally:
             if self.driver:
-                self.driver.quit()
+                self.browser_rss_bytes = driver_rss_bytes(self.driver)
+            self._release_driver()
+            self._save_selector_stats()
+        return snapshots
+    
+    def parse_with_backend(self, backend, product_url: str = "") -> List[Dict]:
+        self.backend = backend
+        self._start_product(product_url)
+        return self.parse_loaded_page()
+    
+    def parse_loaded_page(self) -> List[Dict]:
+        self._handle_initial_page()
+        
+        if self._uses_network_capture() and self._run_step('json_reviews', self._capture_json_reviews):
+            self._debug_print(f"Отзывы получены из JSON виджетов: {len(self.reviews)}")
+            return self.reviews
+        
+        if self._uses_hybrid_paging() and self._run_step('http_paging', self._fetch_reviews_over_http):
+            self._debug_print(f"Отзывы получены по HTTP с сессией браузера: {len(self.reviews)}")
+            return self.reviews
+        
+        if self._run_step('product_page', self._scan_product_page):
+            return self.reviews
+        
+        self._run_step('open_reviews', self._open_reviews_page)
+        self._run_step('reviews_page', self._parse_all_reviews)
+        return self.reviews
+    
+    def _start_product(self, product_url: str):
+        self.reviews = []
+        self.served_by = None
+        self.http_requests = 0
+        self.product_id = self._extract_product_id(product_url)
+        self.completed_steps = {}
+        self.readiness = {}
+        self.resume_url = product_url
+        self.crash_restarts = 0
+    
+    def _run_step(self, name: str, step):
+        # шаг засчитывается, только если браузер пережил его: иначе после перезапуска он повторится
+        if name in self.completed_steps:
+            return self.completed_steps[name]
+        collected = len(self.reviews)
+        try:
+            result = step()
+            self._check_alive()
+        except Exception:
+            del self.reviews[collected:]
+            raise
+        self.completed_steps[name] = result
+        return result
+    
+    def _check_alive(self):
+        if self.backend.live:
+            self.backend.execute_script("return 1")
+    
+    def _recover_from_crash(self, error: Exception) -> bool:
+        kind = classify_crash(error)
+        retries = self.config.crash_retries if self.config else 2
+        if not kind or self.crash_restarts >= retries:
+            return False
+        
+        self.crash_restarts += 1
+        done = ', '.join(self.completed_steps) or 'нет'
+        self._debug_print(f"Сбой браузера ({kind}): {error}. Перезапуск {self.crash_restarts}/{retries}, "
+                          f"выполненные шаги: {done}")
+        self._release_driver(crashed=True)
+        self._acquire_driver()
+        return True
+    
+    def _acquire_driver(self):
+        if self.pool:
+            self.attach_driver(self.pool.acquire())
+            self.profile_dir = self.pool.stats(self.driver).profile_dir
+        else:
+            self._setup_driver()
+    
+    def _release_driver(self, crashed: bool = False):
+        if self.pool:
+            if crashed:
+                self.pool.discard(self.driver)
+            else:
+                self.pool.release(self.driver)
+            self.attach_driver(None)
+            return
+        
+        if self.driver:
+            try:
+                close_driver(self.driver)
+            except Exception:
+                if not crashed:
+                    raise
+            self.attach_driver(None)
+        if self.profile_dir:
+            profile_allocator(self.config.profile_root).release(self.profile_dir)
+            self.profile_dir = None
+        if self.endpoint:
+            endpoint_scheduler(self.config).release(self.endpoint, failed=crashed)
+            self.endpoint = None
+    
+    def _uses_hybrid_paging(self) -> bool:
+        return bool(self.config) and self.config.hybrid_mode and self.driver is not None
+    
+    def _fetch_reviews_over_http(self) -> bool:
+        # первая страница уже загружена браузером: по HTTP запрашиваются только следующие
+        first_page = self._widget_state_reviews()
+        session = self._export_session()
+        http_parser = OzonHttpReviewsParser(self.config, session)
+        http_parser.debug = self.debug
+        try:
+            reviews = http_parser.fetch_reviews(
+                product_path(self.backend.current_url) + 'reviews/', first_page=2 if first_page else 1
+            )
+        except HttpBackendError as e:
+            if not first_page:
+                self._debug_print(f"HTTP-запросы с сессией браузера отклонены ({e}), продолжаем в браузере")
+                return False
+            self._debug_print(f"Следующие страницы по HTTP не получены ({e})")
+            reviews = []
+        finally:
+            self.http_requests += http_parser.requests_made
+        
+        reviews = dedupe_reviews(first_page + reviews)
+        if not reviews:
+            self._debug_print("По HTTP отзывы не получены, продолжаем в браузере")
+            return False
+        self.reviews.extend(reviews)
+        self.served_by = 'hybrid'
+        return True
+    
+    def _export_session(self):
+        # сессия живёт вместе с браузером, чтобы соединения переиспользовались между товарами
+        session = getattr(self.driver, 'http_session', None)
+        if session is None:
+            session = create_session(self.config)
+            self.driver.http_session = session
+        
+        session.cookies.clear()
+        for cookie in self.driver.get_cookies():
+            session.cookies.set(
+                cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/')
+            )
+        session.headers['User-Agent'] = self.backend.execute_script("return navigator.userAgent")
+        session.headers['Referer'] = self.backend.current_url
+        return session
+    
+    def _capture_json_reviews(self) -> bool:
+        self.reviews.extend(self._collect_json_reviews())
+        if not self.reviews:
+            self._debug_print("JSON с отзывами не найден, используем DOM")
+        return bool(self.reviews)
+    
+    def _scan_product_page(self) -> bool:
+        self._save_debug_html("product_page.html")
+        return self._find_reviews_on_product_page()
+    
+    def _open_reviews_page(self):
+        self._navigate_to_reviews()
+        self._save_debug_html("reviews_page.html")
+        if self.backend.live:
+            self.resume_url = self.backend.current_url
+    
+    def _uses_network_capture(self) -> bool:
+        return bool(self.config) and self.config.extraction_mode == 'network'
+    
+    def _drain_network_log(self):
+        if self._uses_network_capture():
+            try:
+                self.driver.get_log('performance')
+            except Exception:
+                pass
+    
+    def _widget_state_reviews(self) -> List[Dict]:
+        reviews = []
+        try:
+            states = self.backend.execute_script(WIDGET_STATES_SCRIPT) or {}
+            for key, state in states.items():
+                if key.startswith(('webListReviews', 'webReviews')):
+                    reviews.extend(extract_reviews_from_widget_state(state))
+        except Exception as e:
+            self._debug_print(f"Ошибка чтения состояний виджетов: {e}")
+        return reviews
+    
+    def _collect_json_reviews(self) -> List[Dict]:
+        reviews = self._widget_state_reviews()
+        
+        # лог производительности общий для всех вкладок браузера
+        if self.driver and self.config.tabs_per_browser == 1:
+            for index, body in enumerate(self._captured_payloads()):
+                self._save_payload(body, index)
+                reviews.extend(extract_reviews_from_payload(body))
+        
+        return dedupe_reviews(reviews)
+    
+    def _captured_payloads(self) -> List[str]:
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            self._debug_print(f"Лог производительности недоступен: {e}")
+            return []
+        
+        payloads = []
+        for entry in entries:
+            try:
+                message = json.loads(entry['message'])['message']
+                if message.get('method') != 'Network.responseReceived':
+                    continue
+                params = message['params']
+                if not is_review_payload_url(params['response']['url']):
+                    continue
+                body = self.driver.execute_cdp_cmd(
+                    'Network.getResponseBody', {'requestId': params['requestId']}
+                )
+                payloads.append(body.get('body', ''))
+            except Exception:
+                continue
+        return payloads
+    
+    def _save_payload(self, body: str, index: int):
+        if not (self.config and self.config.payloads_dir):
+            return
+        os.makedirs(self.config.payloads_dir, exist_ok=True)
+        filename = os.path.join(self.config.payloads_dir, f"{self.product_id or 'unknown'}_{index}.json")
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(body)
+    
+    def _open_url(self, url: str):
+        self.backend.navigate(url)
+        self._note_page()
+    
+    def _note_page(self):
+        if self.pool:
+            self.pool.record_page(self.driver)
     
     def _extract_product_id(self, url: str) -> str:
         if '/product/' in url:
@@ -99,12 +404,13 @@ class OzonReviewsParserImproved:
         return ""
     
     def _handle_initial_page(self):
-        WebDriverWait(self.driver, 15).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        self.backend.wait_for_body(15)
         
-        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-        time.sleep(2)
+        self.backend.scroll_to(0.5)
+        if self._uses_readiness_wait():
+            self._wait_for_reviews_ready()
+        else:
+            self.backend.pause(2)
         
         try:
             captcha_selectors = [
@@ -114,31 +420,64 @@ class OzonReviewsParserImproved:
             ]
             
             for selector in captcha_selectors:
-                if self.driver.find_elements(By.CSS_SELECTOR, selector):
+                if self.backend.find_all(selector):
                     self._debug_print("Обнаружена капча")
-                    if not (self.config and self.config.headless):
+                    if self.backend.live and not (self.config and self.config.headless):
                         input("Решите капчу и нажмите Enter для продолжения...")
                     break
         except:
             pass
         
-        try:
-            cookie_selectors = [
-                '[data-widget="cookieConsent"] button',
-                'button[data-testid="cookie-accept"]',
-                '.cookie-consent button'
-            ]
-            
-            for selector in cookie_selectors:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                if elements:
-                    elements[0].click()
-                    time.sleep(1)
-                    break
-        except:
-            pass
+        if not consent_done(self.profile_dir):
+            try:
+                cookie_selectors = [
+                    '[data-widget="cookieConsent"] button',
+                    'button[data-testid="cookie-accept"]',
+                    '.cookie-consent button'
+                ]
+                
+                for selector in cookie_selectors:
+                    elements = self.backend.find_all(selector)
+                    if elements:
+                        self.backend.click(elements[0])
+                        self.backend.pause(1)
+                        # без клика (капча, баннер ещё не отрисован) согласие проверяется снова
+                        mark_consent_done(self.profile_dir)
+                        break
+            except:
+                pass
         
-        time.sleep(random.uniform(2, 4))
+        if not self._uses_readiness_wait():
+            self.backend.pause(random.uniform(2, 4))
+        
+        if self.backend.live and uses_disk_cache(self.config):
+            record_cache_stats(self.backend)
+    
+    def _uses_readiness_wait(self) -> bool:
+        return bool(self.config) and (
+            self.config.page_load_strategy != 'normal' or self.config.tabs_per_browser > 1
+        )
+    
+    def _wait_for_reviews_ready(self, timeout: float = None) -> bool:
+        # после таймаута на этом адресе отзывов не ждём: иначе каждый шаг терял бы review_ready_timeout
+        url = self.backend.current_url
+        if self.readiness.get(url) is False:
+            return False
+        
+        started = time.monotonic()
+        ready = self.backend.wait_for_any(READY_SELECTORS, timeout or self.config.review_ready_timeout)
+        self.readiness[url] = ready
+        if ready:
+            self._debug_print(f"Виджет отзывов готов через {time.monotonic() - started:.2f} с")
+        else:
+            self._debug_print("Виджет отзывов не появился, продолжаем")
+        return ready
+    
+    def _settle(self, seconds: float):
+        if self._uses_readiness_wait():
+            self._wait_for_reviews_ready(min(seconds, self.config.review_ready_timeout))
+        else:
+            self.backend.pause(seconds)
     
     def _find_reviews_on_product_page(self) -> bool:
         self._debug_print("Ищем отзывы на странице товара...")
@@ -153,54 +492,58 @@ class OzonReviewsParserImproved:
             '.review-list',
             '.reviews-container'
         ]
+        review_container_selectors = self._with_mobile_selectors('review', review_container_selectors)
         
-        for selector in review_container_selectors:
+        for selector in self._ordered_selectors('container', review_container_selectors):
             try:
-                elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.backend.find_all(selector)
+                self._record_selector('container', selector, bool(elements))
                 if elements:
                     self._debug_print(f"Найден контейнер отзывов: {selector}")
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", elements[0])
-                    time.sleep(2)
+                    self.backend.scroll_into_view(elements[0])
+                    self._settle(2)
                     
                     reviews = self._parse_reviews_in_container(elements[0])
                     if reviews:
                         self.reviews.extend(reviews)
                         self._debug_print(f"Найдено {len(reviews)} отзывов в контейнере")
+                        self._record_lookup('container', True)
                         return True
             except Exception as e:
+                self._record_selector('container', selector, False)
                 self._debug_print(f"Ошибка при поиске в {selector}: {e}")
                 continue
         
+        self._record_lookup('container', False)
         return False
     
     def _parse_reviews_in_container(self, container) -> List[Dict]:
-        reviews = []
+        if self.backend.live:
+            reviews = self._extract_review_cards(container)
+            if reviews is not None:
+                return reviews
         
-        review_item_selectors = [
-            'div[data-widget="webReviewCard"]',
-            '.review-item',
-            '.review-card',
-            '[data-testid="review"]',
-            '.review',
-            'div:has(.review-text)',
-            'div:has([data-widget="webReviewText"])'
-        ]
+        reviews = []
+        review_item_selectors = self._with_mobile_selectors('review_item', REVIEW_ITEM_SELECTORS)
         
         review_elements = []
-        for selector in review_item_selectors:
+        for selector in self._ordered_selectors('review_item', review_item_selectors):
             try:
-                elements = container.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.backend.find_all(selector, container)
+                self._record_selector('review_item', selector, bool(elements))
                 if elements:
                     self._debug_print(f"Найдены элементы отзывов: {selector} ({len(elements)} шт.)")
                     review_elements = elements
                     break
             except:
+                self._record_selector('review_item', selector, False)
                 continue
+        self._record_lookup('review_item', bool(review_elements))
         
         if not review_elements:
             self._debug_print("Используем универсальный поиск отзывов...")
-            all_divs = container.find_elements(By.TAG_NAME, "div")
-            review_elements = [div for div in all_divs if len(div.text.strip()) > 50]
+            all_divs = self.backend.find_by_tag("div", container)
+            review_elements = [div for div in all_divs if len(self.backend.text(div).strip()) > 50]
         
         for element in review_elements:
             try:
@@ -217,40 +560,30 @@ class OzonReviewsParserImproved:
         try:
             review_data = {}
             
-            element_text = element.text.strip()
+            element_text = self.backend.text(element).strip()
             if len(element_text) < 10:
                 return None
             
-            author_selectors = [
-                '.review-author', '.author', '[data-widget="webReviewAuthor"]',
-                '.user-name', '.reviewer-name', '.review-user',
-                'span:contains("пользователь")', 'div:contains("@")'
-            ]
-            author = self._get_text_by_selectors_universal(element, author_selectors)
+            author_selectors = self._with_mobile_selectors('author', AUTHOR_SELECTORS)
+            author = self._get_text_by_selectors_universal(element, author_selectors, 'author')
             
             rating = self._extract_rating_universal(element)
             
-            text_selectors = [
-                '.review-text', '[data-widget="webReviewText"]',
-                '.review-content', '.comment-text', '.review-body'
-            ]
-            text = self._get_text_by_selectors_universal(element, text_selectors)
+            text_selectors = self._with_mobile_selectors('text', TEXT_SELECTORS)
+            text = self._get_text_by_selectors_universal(element, text_selectors, 'text')
             
             if not text:
                 text = element_text
             
-            date_selectors = [
-                '.review-date', '.date', '[data-widget="webReviewDate"]',
-                'time', '.review-time'
-            ]
-            date = self._get_text_by_selectors_universal(element, date_selectors)
+            date = self._get_text_by_selectors_universal(element, DATE_SELECTORS, 'date')
             
             review_data = {
+                'id': self._review_id(element),
                 'author': author or 'Неизвестный автор',
                 'rating': rating or 0,
                 'text': text or element_text,
                 'date': date or '',
-                'raw_html': element.get_attribute('outerHTML')[:500]
+                'raw_html': self.backend.outer_html(element)[:500]
             }
             
             return review_data if review_data['text'] else None
@@ -259,35 +592,115 @@ class OzonReviewsParserImproved:
             self._debug_print(f"Ошибка при извлечении данных отзыва: {e}")
             return None
     
-    def _get_text_by_selectors_universal(self, parent_element, selectors: List[str]) -> str:
-        for selector in selectors:
+    def _extract_review_cards(self, container) -> Optional[List[Dict]]:
+        # одна команда WebDriver на контейнер вместо десятков find_elements на каждую карточку
+        try:
+            result = self.backend.execute_script(REVIEW_CARDS_SCRIPT, container, self._card_selectors())
+        except Exception as e:
+            self._debug_print(f"Скрипт извлечения отзывов не сработал: {e}")
+            return None
+        if result is None:
+            return None
+        
+        if result['matched']:
+            self._debug_print(f"Найдены элементы отзывов: {result['matched']} ({result['items']} шт.)")
+            self._record_selector('review_item', result['matched'], True)
+        else:
+            self._debug_print("Используем универсальный поиск отзывов...")
+        self._record_lookup('review_item', bool(result['matched']))
+        return result['reviews']
+    
+    def _card_selectors(self) -> Dict[str, List[str]]:
+        # внутри страницы промах селектора поля почти ничего не стоит, учитывается только порядок карточек
+        return {
+            'items': self._script_selectors(self._ordered_selectors(
+                'review_item', self._with_mobile_selectors('review_item', REVIEW_ITEM_SELECTORS)
+            )),
+            'author': self._script_selectors(self._with_mobile_selectors('author', AUTHOR_SELECTORS)),
+            'text': self._script_selectors(self._with_mobile_selectors('text', TEXT_SELECTORS)),
+            'date': self._script_selectors(DATE_SELECTORS),
+            'rating': self._script_selectors(self._with_mobile_selectors('rating', RATING_SELECTORS)),
+            'filled_star': FILLED_STAR_SELECTOR,
+            'ids': REVIEW_ID_ATTRIBUTES,
+        }
+    
+    def _script_selectors(self, selectors: List[str]) -> List[Dict]:
+        return [compile_selector(selector).script_arg() for selector in selectors]
+    
+    def _review_id(self, element) -> str:
+        for name in REVIEW_ID_ATTRIBUTES:
+            value = self.backend.attribute(element, name)
+            if value:
+                return value
+        return ''
+    
+    def _with_mobile_selectors(self, name: str, selectors: List[str]) -> List[str]:
+        if not is_mobile(self.config):
+            return selectors
+        mobile = getattr(self.config, f'mobile_{name}_selectors')
+        return mobile + [selector for selector in selectors if selector not in mobile]
+    
+    def _get_text_by_selectors_universal(self, parent_element, selectors: List[str], role: str = None) -> str:
+        for selector in self._ordered_selectors(role, selectors):
             try:
-                elements = parent_element.find_elements(By.CSS_SELECTOR, selector)
+                elements = self.backend.find_all(selector, parent_element)
+                self._record_selector(role, selector, bool(elements))
                 if elements:
-                    return elements[0].text.strip()
+                    self._record_lookup(role, True)
+                    return self.backend.text(elements[0]).strip()
             except:
+                self._record_selector(role, selector, False)
                 continue
+        self._record_lookup(role, False)
         return ""
     
+    def _ordered_selectors(self, role: str, selectors: List[str]) -> List[str]:
+        if not (self.selector_stats and role):
+            return selectors
+        return self.selector_stats.order(self._stats_key(role), selectors)
+    
+    def _record_selector(self, role: str, selector: str, hit: bool):
+        if self.selector_stats and role:
+            self.selector_stats.record(self._stats_key(role), selector, hit)
+    
+    def _record_lookup(self, role: str, success: bool):
+        if self.selector_stats and role:
+            self.selector_stats.record_lookup(self._stats_key(role), success)
+    
+    def _stats_key(self, role: str) -> str:
+        page = 'reviews' if 'open_reviews' in self.completed_steps else 'product'
+        if is_mobile(self.config):
+            page = 'mobile_' + page
+        # серверная разметка и сохранённые снимки отличаются от живого DOM: у них своя статистика
+        if self.backend.kind != 'dom':
+            page = f"{self.backend.kind}/{page}"
+        return f"{page}/{role}"
+    
+    def _save_selector_stats(self):
+        if self.selector_stats:
+            try:
+                self.selector_stats.save()
+            except OSError as e:
+                self._debug_print(f"Не удалось сохранить статистику селекторов: {e}")
+    
     def _extract_rating_universal(self, element) -> int:
-        rating_selectors = [
-            '[data-widget="webRating"]',
-            '.rating', '.stars', '.review-rating'
-        ]
+        rating_selectors = self._with_mobile_selectors('rating', RATING_SELECTORS)
         
-        for selector in rating_selectors:
+        for selector in self._ordered_selectors('rating', rating_selectors):
             try:
-                rating_elements = element.find_elements(By.CSS_SELECTOR, selector)
+                rating_elements = self.backend.find_all(selector, element)
+                self._record_selector('rating', selector, bool(rating_elements))
                 if rating_elements:
-                    filled_stars = rating_elements[0].find_elements(By.CSS_SELECTOR, '[data-index]:not([data-state="empty"])')
+                    filled_stars = self.backend.find_all(FILLED_STAR_SELECTOR, rating_elements[0])
                     if filled_stars:
                         return len(filled_stars)
                     
-                    rating_text = rating_elements[0].text
+                    rating_text = self.backend.text(rating_elements[0])
                     for char in rating_text:
                         if char.isdigit() and int(char) <= 5:
                             return int(char)
             except:
+                self._record_selector('rating', selector, False)
                 continue
         
         return 0
@@ -301,38 +714,38 @@ class OzonReviewsParserImproved:
                 'a[href*="reviews"]',
                 '[data-widget="webProductRating"] a',
                 '.product-review-summary a',
-                'a:contains("отзыв")',
-                'a:contains("Отзыв")',
+                'a:icontains("отзыв")',
                 '[data-testid="reviews-link"]',
                 '.reviews-link'
             ]
             
             reviews_link = None
-            for selector in reviews_link_selectors:
+            for selector in self._ordered_selectors('reviews_link', reviews_link_selectors):
                 try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    elements = self.backend.find_all(selector)
+                    self._record_selector('reviews_link', selector, bool(elements))
                     if elements:
                         reviews_link = elements[0]
                         self._debug_print(f"Ссылка: {selector}")
                         break
                 except:
+                    self._record_selector('reviews_link', selector, False)
                     continue
+            self._record_lookup('reviews_link', reviews_link is not None)
             
             if reviews_link:
-                self.driver.execute_script("arguments[0].scrollIntoView(true);", reviews_link)
-                time.sleep(1)
-                try:
-                    reviews_link.click()
-                except:
-                    self.driver.execute_script("arguments[0].click();", reviews_link)
+                self.backend.scroll_into_view(reviews_link)
+                self.backend.pause(1)
+                self.backend.click(reviews_link)
+                self._note_page()
                 
-                time.sleep(3)
+                self._settle(3)
             else:
                 self._debug_print("переход по прямой ссылке на отзывы")
-                base_url = self.driver.current_url.split('?')[0]
+                base_url = self.backend.current_url.split('?')[0]
                 reviews_url = f"{base_url}?tab=reviews"
-                self.driver.get(reviews_url)
-                time.sleep(3)
+                self._open_url(reviews_url)
+                self._settle(3)
                 
         except Exception as e:
             self._debug_print(f"ошибка при навигации к отзывам: {e}")
@@ -349,33 +762,24 @@ class OzonReviewsParserImproved:
             self._debug_print("Отзывы не найдены на текущей странице")
     
     def _find_reviews_on_current_page(self) -> List[Dict]:
-        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
+        self.backend.scroll_to(1)
+        self._settle(2)
         
-        all_elements = self.driver.find_elements(By.TAG_NAME, "div")
-        potential_reviews = []
+        rating_selectors = self._with_mobile_selectors('rating', RATING_SELECTORS)
+        blocks = self.backend.review_blocks(block_params(rating_selectors, FILLED_STAR_SELECTOR))
+        self._debug_print(f"Найдено блоков, похожих на отзывы: {len(blocks)}")
         
-        for element in all_elements:
-            try:
-                text = element.text.strip()
-                if (len(text) > 30 and 
-                    len(text) < 2000 and 
-                    not any(skip_word in text.lower() for skip_word in ['cookie', 'реклама', 'навигация', 'меню'])):
-                    
-                    review_data = {
-                        'author': 'Неизвестный автор',
-                        'rating': 0,
-                        'text': text,
-                        'date': '',
-                        'element_tag': element.tag_name,
-                        'element_class': element.get_attribute('class') or ''
-                    }
-                    potential_reviews.append(review_data)
-                    
-            except:
-                continue
-        
-        return potential_reviews[:50] if potential_reviews else []
+        return [
+            {
+                'author': 'Неизвестный автор',
+                'rating': block['rating'],
+                'text': block['text'],
+                'date': block['date'],
+                'element_tag': block['element_tag'],
+                'element_class': block['element_class']
+            }
+            for block in blocks
+        ]
     
     def save_reviews_to_json(self, filename: str):
         with open(filename, 'w', encoding='utf-8') as f:
@@ -0,0 +1,245 @@
+# только список и карточки отзывов: обёртка webReviews и сводка рейтинга
+# появляются вместе со страницей товара, раньше самих отзывов
+READY_SELECTORS = [
+    '[data-widget="webListReviews"]',
+    '[data-widget="webReviewCard"]',
+    '[id^="state-webListReviews"]',
+]
+
+WIDGET_STATE_SELECTOR = '[id^="state-web"][data-state]'
+
+WIDGET_STATES_SCRIPT = """
+const states = {};
+for (const node of document.querySelectorAll('[id^="state-web"][data-state]')) {
+    states[node.id.replace(/^state-/, '')] = node.getAttribute('data-state');
+}
+return states;
+"""
+
+REVIEWS_READY_SCRIPT = """
+for (const selector of arguments[0]) {
+    if (document.querySelector(selector)) {
+        return true;
+    }
+}
+return false;
+"""
+
+# прокрутка к середине запускает ленивую загрузку отзывов; проверка готовности страницу не двигает
+SCROLL_TO_REVIEWS_SCRIPT = """
+window.scrollTo(0, document.body ? document.body.scrollHeight / 2 : 0);
+"""
+
+TEXT_QUERY_FUNCTION = """
+function queryAll(node, selector) {
+    const spec = typeof selector === 'string' ? {css: selector, texts: []} : selector;
+    let found;
+    try {
+        found = Array.from(node.querySelectorAll(spec.css));
+    } catch (e) {
+        return [];
+    }
+    if (!spec.texts.length) {
+        return found;
+    }
+    found = found.filter(element => spec.texts.every(([needle, ignoreCase]) => {
+        const content = element.textContent;
+        return ignoreCase ? content.toLowerCase().includes(needle.toLowerCase()) : content.includes(needle);
+    }));
+    return found.filter(element => !found.some(other => other !== element && element.contains(other)));
+}
+"""
+
+TEXT_QUERY_SCRIPT = TEXT_QUERY_FUNCTION + """
+return queryAll(arguments[0] || document, arguments[1]);
+"""
+
+REVIEW_CARDS_SCRIPT = TEXT_QUERY_FUNCTION + """
+const container = arguments[0] || document;
+const selectors = arguments[1];
+
+function firstText(node, list) {
+    for (const selector of list) {
+        const found = queryAll(node, selector);
+        if (found.length) {
+            return found[0].innerText.trim();
+        }
+    }
+    return '';
+}
+
+function rating(node) {
+    for (const selector of selectors.rating) {
+        const found = queryAll(node, selector);
+        if (!found.length) {
+            continue;
+        }
+        const filled = queryAll(found[0], selectors.filled_star);
+        if (filled.length) {
+            return filled.length;
+        }
+        for (const ch of found[0].innerText) {
+            if (ch >= '0' && ch <= '5') {
+                return Number(ch);
+            }
+        }
+    }
+    return 0;
+}
+
+let matched = '';
+let items = [];
+for (const selector of selectors.items) {
+    items = queryAll(container, selector);
+    if (items.length) {
+        matched = typeof selector === 'string' ? selector : selector.source;
+        break;
+    }
+}
+if (!items.length) {
+    items = queryAll(container, 'div').filter(div => div.innerText.trim().length > 50);
+}
+
+const reviews = [];
+for (const item of items) {
+    const elementText = item.innerText.trim();
+    if (elementText.length < 10) {
+        continue;
+    }
+    let id = '';
+    for (const name of selectors.ids) {
+        id = item.getAttribute(name) || '';
+        if (id) {
+            break;
+        }
+    }
+    reviews.push({
+        id: id,
+        author: firstText(item, selectors.author) || 'Неизвестный автор',
+        rating: rating(item),
+        text: firstText(item, selectors.text) || elementText,
+        date: firstText(item, selectors.date),
+        raw_html: item.outerHTML.slice(0, 500)
+    });
+}
+return {matched: matched, items: items.length, reviews: reviews};
+"""
+
+REVIEW_BLOCKS_SCRIPT = """
+const root = arguments[0] || document;
+const params = arguments[1];
+const datePattern = new RegExp(params.date_pattern, 'i');
+const weights = params.weights;
+
+function signature(element) {
+    return element.tagName + '.' + element.className;
+}
+
+function repeated(element) {
+    const parent = element.parentElement;
+    if (!parent) {
+        return false;
+    }
+    const own = signature(element);
+    let same = 0;
+    for (const sibling of parent.children) {
+        if (signature(sibling) === own && ++same >= 2) {
+            return true;
+        }
+    }
+    return false;
+}
+
+function rating(element) {
+    const widget = element.querySelector(params.star_selector);
+    if (!widget) {
+        return 0;
+    }
+    const filled = widget.querySelectorAll(params.filled_star_selector).length;
+    if (filled) {
+        return filled;
+    }
+    for (const ch of widget.textContent) {
+        if (ch >= '0' && ch <= '5') {
+            return Number(ch);
+        }
+    }
+    return 0;
+}
+
+const scores = new Map();
+const candidates = [];
+for (const element of root.querySelectorAll('div')) {
+    const text = element.textContent.trim();
+    if (text.length < params.min_text || text.length > params.max_text) {
+        continue;
+    }
+    const lower = text.toLowerCase();
+    if (params.skip_words.some(word => lower.includes(word))) {
+        continue;
+    }
+    let score = 0;
+    if (element.querySelector(params.star_selector)) {
+        score += weights.stars;
+    }
+    if (datePattern.test(text)) {
+        score += weights.date;
+    }
+    if (text.length >= params.body_text) {
+        score += weights.text;
+    }
+    if (repeated(element)) {
+        score += weights.repeated;
+    }
+    if (score >= params.threshold) {
+        candidates.push(element);
+        scores.set(element, score);
+    }
+}
+
+// вложенные кандидаты образуют дерево: узел с двумя ветвями и его предки — списки, а не отзывы
+const parentOf = new Map();
+const children = new Map();
+for (const element of candidates) {
+    let node = element.parentElement;
+    while (node && !scores.has(node)) {
+        node = node.parentElement;
+    }
+    parentOf.set(element, node);
+    if (node) {
+        children.set(node, (children.get(node) || 0) + 1);
+    }
+}
+const branching = new Set();
+for (const element of candidates) {
+    if ((children.get(element) || 0) >= 2) {
+        let node = element;
+        while (node && !branching.has(node)) {
+            branching.add(node);
+            node = parentOf.get(node);
+        }
+    }
+}
+
+const blocks = [];
+for (const element of candidates) {
+    const parent = parentOf.get(element);
+    if (branching.has(element) || (parent && !branching.has(parent))) {
+        continue;
+    }
+    const text = element.innerText.trim();
+    const date = text.match(datePattern);
+    blocks.push({
+        text: text,
+        date: date ? date[0] : '',
+        rating: rating(element),
+        score: scores.get(element),
+        element_tag: element.tagName.toLowerCase(),
+        element_class: element.className
+    });
+    if (blocks.length >= params.limit) {
+        break;
+    }
+}
+return blocks;
+"""
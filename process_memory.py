@@ -0,0 +1,50 @@
+import os
+from typing import List
+
+
+def process_tree_pids(root_pid: int) -> List[int]:
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return [root_pid]
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # имя процесса в скобках может содержать пробелы
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    pids = [root_pid]
+    for pid in pids:
+        pids.extend(children.get(pid, []))
+    return pids
+
+
+def process_rss_bytes(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+
+def process_tree_rss_bytes(root_pid: int) -> int:
+    return sum(process_rss_bytes(pid) for pid in process_tree_pids(root_pid))
+
+
+def driver_rss_bytes(driver) -> int:
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return 0
+    return process_tree_rss_bytes(pid)
@@ -0,0 +1,128 @@
+import os
+import threading
+
+LOCK_FILE = '.parser.lock'
+CONSENT_MARKER = '.consent_done'
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+ERROR_ACCESS_DENIED = 5
+STILL_ACTIVE = 259
+
+_allocators = {}
+_allocators_lock = threading.Lock()
+
+
+class ProfileAllocator:
+
+    def __init__(self, root: str, max_profiles: int = 256):
+        self.root = os.path.abspath(root)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+        self._held = set()
+        os.makedirs(self.root, exist_ok=True)
+
+    def acquire(self) -> str:
+        with self._lock:
+            for index in range(self.max_profiles):
+                path = os.path.join(self.root, f"worker-{index}")
+                if path in self._held:
+                    continue
+                if self._lock_profile(path):
+                    self._held.add(path)
+                    return path
+        raise RuntimeError(f"Нет свободных профилей Chrome в {self.root}")
+
+    def release(self, path: str):
+        with self._lock:
+            if path not in self._held:
+                return
+            self._held.discard(path)
+            try:
+                os.remove(os.path.join(path, LOCK_FILE))
+            except OSError:
+                pass
+
+    def _lock_profile(self, path: str) -> bool:
+        os.makedirs(path, exist_ok=True)
+        lock_path = os.path.join(path, LOCK_FILE)
+        for _ in range(2):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._is_stale(lock_path):
+                    return False
+                try:
+                    os.remove(lock_path)
+                except OSError:
+                    return False
+                continue
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return True
+        return False
+
+    def _is_stale(self, lock_path: str) -> bool:
+        try:
+            with open(lock_path, 'r') as f:
+                pid = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return False
+        if pid == os.getpid():
+            # профиль остался от этого же процесса, но не числится занятым
+            return True
+        return not _pid_alive(pid)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == 'nt':
+        # os.kill на Windows завершает процесс, поэтому проверяем через WinAPI
+        return _pid_alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _pid_alive_windows(pid: int) -> bool:
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    kernel32.GetExitCodeProcess.argtypes = [wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD)]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # процесс есть, но принадлежит другому пользователю
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def profile_allocator(root: str) -> ProfileAllocator:
+    key = os.path.abspath(root)
+    with _allocators_lock:
+        if key not in _allocators:
+            _allocators[key] = ProfileAllocator(key)
+        return _allocators[key]
+
+
+def consent_done(profile_dir: str) -> bool:
+    return bool(profile_dir) and os.path.exists(os.path.join(profile_dir, CONSENT_MARKER))
+
+
+def mark_consent_done(profile_dir: str):
+    if profile_dir:
+        open(os.path.join(profile_dir, CONSENT_MARKER), 'w').close()
@@ -0,0 +1,111 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from selenium import webdriver
+from selenium.webdriver.chrome.remote_connection import ChromeRemoteConnection
+from selenium.webdriver.remote.command import Command
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+@dataclass
+class RemoteEndpoint:
+    url: str
+    weight: float = 1.0
+    capacity: int = 1
+    in_use: int = 0
+    sessions_started: int = 0
+    failures: int = 0
+    connection: ChromeRemoteConnection = field(default=None, repr=False)
+
+    @property
+    def load(self) -> float:
+        return (self.in_use + 1) / self.weight
+
+
+class RemoteChrome(webdriver.Remote):
+
+    def get_log(self, log_type: str):
+        return self.execute(Command.GET_LOG, {'type': log_type})['value']
+
+    def quit(self):
+        # соединение общее для всех сессий узла: закрываем только сессию, keep-alive сохраняется
+        try:
+            self.execute(Command.QUIT)
+        finally:
+            self.stop_client()
+
+
+class EndpointScheduler:
+
+    def __init__(self, endpoints: List[RemoteEndpoint]):
+        self.endpoints = endpoints
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return sum(endpoint.capacity for endpoint in self.endpoints)
+
+    def acquire(self) -> RemoteEndpoint:
+        with self._lock:
+            free = [endpoint for endpoint in self.endpoints if endpoint.in_use < endpoint.capacity]
+            if not free:
+                raise RuntimeError("Нет свободных слотов на удалённых WebDriver")
+            endpoint = min(free, key=lambda endpoint: (endpoint.load, endpoint.failures))
+            endpoint.in_use += 1
+            endpoint.sessions_started += 1
+            if endpoint.connection is None:
+                endpoint.connection = ChromeRemoteConnection(endpoint.url, keep_alive=True)
+            return endpoint
+
+    def release(self, endpoint: RemoteEndpoint, failed: bool = False):
+        with self._lock:
+            endpoint.in_use = max(0, endpoint.in_use - 1)
+            if failed:
+                endpoint.failures += 1
+
+    def report(self) -> List[Dict]:
+        with self._lock:
+            return [
+                {
+                    'url': endpoint.url,
+                    'weight': endpoint.weight,
+                    'capacity': endpoint.capacity,
+                    'in_use': endpoint.in_use,
+                    'sessions_started': endpoint.sessions_started,
+                    'failures': endpoint.failures,
+                }
+                for endpoint in self.endpoints
+            ]
+
+
+def parse_endpoints(config) -> List[RemoteEndpoint]:
+    if not (config and config.remote_endpoints):
+        return []
+    entries = config.remote_endpoints
+    if isinstance(entries, str):
+        entries = [entry.strip() for entry in entries.split(',') if entry.strip()]
+
+    endpoints = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'url': entry}
+        endpoints.append(RemoteEndpoint(
+            url=entry['url'].rstrip('/'),
+            weight=float(entry.get('weight', 1.0)),
+            capacity=int(entry.get('capacity', config.remote_capacity)),
+        ))
+    return endpoints
+
+
+def endpoint_scheduler(config) -> EndpointScheduler:
+    endpoints = parse_endpoints(config)
+    if not endpoints:
+        return None
+    key = tuple((endpoint.url, endpoint.weight, endpoint.capacity) for endpoint in endpoints)
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = EndpointScheduler(endpoints)
+        return _schedulers[key]
@@ -0,0 +1,68 @@
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from http_backend import PAGE_JSON_PATH, payload_filename
+
+
+def make_handler(payloads_dir: str):
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            parts = urlsplit(self.path)
+            if parts.path == PAGE_JSON_PATH:
+                page_url = parse_qs(parts.query).get('url', [''])[0]
+                filename = os.path.join(payloads_dir, payload_filename(page_url))
+                content_type = 'application/json; charset=utf-8'
+            else:
+                filename = os.path.join(payloads_dir, payload_filename(parts.path) + '.html')
+                content_type = 'text/html; charset=utf-8'
+
+            if not os.path.isfile(filename):
+                self.send_error(404)
+                return
+
+            with open(filename, 'rb') as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def create_replay_server(payloads_dir: str, port: int = 0) -> ThreadingHTTPServer:
+    return ThreadingHTTPServer(('127.0.0.1', port), make_handler(payloads_dir))
+
+
+def start_replay_server(payloads_dir: str, port: int = 0):
+    server = create_replay_server(payloads_dir, port)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    if len(sys.argv) < 2:
+        sys.exit(1)
+
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765
+    server = create_replay_server(sys.argv[1], port)
+    print(f"Сервер записанных ответов: http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
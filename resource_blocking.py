@@ -0,0 +1,91 @@
+from typing import Dict, List
+
+RESOURCE_TYPE_PATTERNS = {
+    'image': ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico'],
+    'font': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot'],
+    'media': ['*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg'],
+    'stylesheet': ['*.css'],
+}
+
+TRACKER_PATTERNS = [
+    '*google-analytics.com*',
+    '*googletagmanager.com*',
+    '*doubleclick.net*',
+    '*mc.yandex.ru*',
+    '*an.yandex.ru*',
+    '*yandex.ru/ads*',
+    '*top-fwz1.mail.ru*',
+    '*ad.mail.ru*',
+    '*vk.com/rtrg*',
+    '*criteo.com*',
+    '*adfox.ru*',
+    '*analytics.tiktok.com*',
+]
+
+
+def build_blocked_urls(config) -> List[str]:
+    urls = []
+    for resource_type in config.blocked_resource_types:
+        for pattern in RESOURCE_TYPE_PATTERNS.get(resource_type, []):
+            urls.append(pattern)
+            urls.append(pattern + '?*')
+
+    if config.block_third_party:
+        urls.extend(
+            pattern for pattern in TRACKER_PATTERNS
+            if not any(domain in pattern for domain in config.allowed_domains)
+        )
+    return urls
+
+
+def build_block_patterns(config) -> List[Dict]:
+    patterns = []
+    for resource_type in config.blocked_resource_types:
+        for pattern in RESOURCE_TYPE_PATTERNS.get(resource_type, []):
+            patterns.append({'urlPattern': f'*://*/{pattern}', 'block': True})
+
+    if config.block_third_party:
+        for domain in config.allowed_domains:
+            patterns.append({'urlPattern': f'*://{domain}/*', 'block': False})
+            patterns.append({'urlPattern': f'*://*.{domain}/*', 'block': False})
+        patterns.append({'urlPattern': '*://*/*', 'block': True})
+    return patterns
+
+
+def add_blocking_prefs(chrome_options, config):
+    if 'image' in config.blocked_resource_types:
+        prefs = chrome_options.experimental_options.get('prefs', {})
+        prefs['profile.managed_default_content_settings.images'] = 2
+        chrome_options.add_experimental_option('prefs', prefs)
+
+
+def blocked_url_params(config) -> List[Dict]:
+    # urlPatterns (с allowlist доменов) есть только в новых версиях Chrome,
+    # старые используют urls
+    urls = build_blocked_urls(config)
+    return [{'urls': urls, 'urlPatterns': build_block_patterns(config)}, {'urls': urls}]
+
+
+def set_blocked_urls(send, config):
+    *attempts, fallback = blocked_url_params(config)
+    for params in attempts:
+        try:
+            return send('Network.setBlockedURLs', params)
+        except Exception:
+            continue
+    return send('Network.setBlockedURLs', fallback)
+
+
+async def set_blocked_urls_async(send, config):
+    *attempts, fallback = blocked_url_params(config)
+    for params in attempts:
+        try:
+            return await send('Network.setBlockedURLs', params)
+        except Exception:
+            continue
+    return await send('Network.setBlockedURLs', fallback)
+
+
+def apply_resource_blocking(driver, config):
+    driver.execute_cdp_cmd('Network.enable', {})
+    set_blocked_urls(driver.execute_cdp_cmd, config)
@@ -0,0 +1,120 @@
+import re
+from typing import Dict, List
+
+DATE_PATTERN = (
+    r'\d{1,2}\s+(?:января|февраля|марта|апреля|мая|июня|июля|августа|сентября|октября|ноября|декабря)'
+    r'(?:\s+\d{4})?|\d{2}\.\d{2}\.\d{4}'
+)
+
+SKIP_WORDS = ['cookie', 'реклама', 'навигация', 'меню']
+
+WEIGHTS = {'stars': 2, 'date': 2, 'text': 1, 'repeated': 1}
+
+
+def block_params(rating_selectors: List[str], filled_star_selector: str, limit: int = 50) -> Dict:
+    return {
+        'min_text': 30,
+        'max_text': 2000,
+        'body_text': 80,
+        'skip_words': SKIP_WORDS,
+        'date_pattern': DATE_PATTERN,
+        'star_selector': ', '.join(rating_selectors),
+        'filled_star_selector': filled_star_selector,
+        'weights': WEIGHTS,
+        'threshold': 3,
+        'limit': limit,
+    }
+
+
+def detect_review_blocks(root, params: Dict) -> List[Dict]:
+    # то же, что REVIEW_BLOCKS_SCRIPT, но для разметки BeautifulSoup
+    date_pattern = re.compile(params['date_pattern'], re.IGNORECASE)
+    weights = params['weights']
+    scores = {}
+    candidates = []
+
+    for element in root.find_all('div'):
+        text = element.get_text().strip()
+        if not params['min_text'] <= len(text) <= params['max_text']:
+            continue
+        lower = text.lower()
+        if any(word in lower for word in params['skip_words']):
+            continue
+
+        score = 0
+        if element.select_one(params['star_selector']):
+            score += weights['stars']
+        if date_pattern.search(text):
+            score += weights['date']
+        if len(text) >= params['body_text']:
+            score += weights['text']
+        if _repeated(element):
+            score += weights['repeated']
+        if score >= params['threshold']:
+            candidates.append(element)
+            scores[id(element)] = score
+
+    parent_of = {}
+    children = {}
+    for element in candidates:
+        parent = next((node for node in element.parents if id(node) in scores), None)
+        parent_of[id(element)] = parent
+        if parent is not None:
+            children[id(parent)] = children.get(id(parent), 0) + 1
+
+    branching = set()
+    for element in candidates:
+        if children.get(id(element), 0) >= 2:
+            node = element
+            while node is not None and id(node) not in branching:
+                branching.add(id(node))
+                node = parent_of[id(node)]
+
+    blocks = []
+    for element in candidates:
+        parent = parent_of[id(element)]
+        if id(element) in branching or (parent is not None and id(parent) not in branching):
+            continue
+        text = element.get_text('\n', strip=True)
+        date = date_pattern.search(text)
+        blocks.append({
+            'text': text,
+            'date': date.group(0) if date else '',
+            'rating': _rating(element, params),
+            'score': scores[id(element)],
+            'element_tag': element.name,
+            'element_class': ' '.join(element.get('class', [])),
+        })
+        if len(blocks) >= params['limit']:
+            break
+    return blocks
+
+
+def _signature(element) -> str:
+    return element.name + '.' + ' '.join(element.get('class', []))
+
+
+def _repeated(element) -> bool:
+    if element.parent is None:
+        return False
+    own = _signature(element)
+    same = 0
+    for sibling in element.parent.find_all(True, recursive=False):
+        if _signature(sibling) == own:
+            same += 1
+            if same >= 2:
+                return True
+    return False
+
+
+def _rating(element, params: Dict) -> int:
+    widget = element.select_one(params['star_selector'])
+    if widget is None:
+        return 0
+    filled = widget.select(params['filled_star_selector'])
+    if filled:
+        return len(filled)
+    for char in widget.get_text():
+        if char.isdigit() and int(char) <= 5:
+            return int(char)
+    return 0
@@ -0,0 +1,150 @@
+import json
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+REVIEW_PAYLOAD_MARKERS = [
+    '/api/entrypoint-api.bx/page/json/v2',
+    '/api/composer-api.bx/page/json/v2',
+    '/api/composer-api.bx/widget/json/v2',
+    'webListReviews',
+]
+
+REVIEW_WIDGET_PREFIXES = ('webListReviews', 'webReviews', 'webReviewCard')
+
+
+def is_review_payload_url(url: str) -> bool:
+    return any(marker in url for marker in REVIEW_PAYLOAD_MARKERS)
+
+
+def extract_reviews_from_payload(payload) -> List[Dict]:
+    if isinstance(payload, (str, bytes)):
+        try:
+            payload = json.loads(payload)
+        except ValueError:
+            return []
+
+    reviews = []
+    widget_states = _find_widget_states(payload)
+    if widget_states:
+        for key, state in widget_states.items():
+            if key.startswith(REVIEW_WIDGET_PREFIXES):
+                reviews.extend(extract_reviews_from_widget_state(state))
+    else:
+        reviews.extend(_walk_reviews(payload))
+    return dedupe_reviews(reviews)
+
+
+def extract_reviews_from_widget_state(state) -> List[Dict]:
+    if isinstance(state, (str, bytes)):
+        try:
+            state = json.loads(state)
+        except ValueError:
+            return []
+    return list(_walk_reviews(state))
+
+
+def extract_reviews_from_files(paths: Iterable[str]) -> List[Dict]:
+    reviews = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            reviews.extend(extract_reviews_from_payload(f.read()))
+    return dedupe_reviews(reviews)
+
+
+def dedupe_reviews(reviews: List[Dict]) -> List[Dict]:
+    seen = set()
+    unique = []
+    for review in reviews:
+        key = review.get('id') or (review.get('author'), review.get('text'))
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(review)
+    return unique
+
+
+def review_from_json(item: Dict) -> Optional[Dict]:
+    content = item.get('content') if isinstance(item.get('content'), dict) else item
+
+    parts = []
+    for key in ('positive', 'negative', 'comment', 'text'):
+        value = content.get(key)
+        if isinstance(value, str) and value.strip():
+            parts.append(value.strip())
+    text = '\n'.join(parts)
+    if not text:
+        return None
+
+    return {
+        'id': str(item.get('uuid') or item.get('id') or ''),
+        'author': _author_name(item.get('author')) or 'Неизвестный автор',
+        'rating': _to_int(content.get('score') or item.get('score') or item.get('rating')),
+        'text': text,
+        'date': _to_date(item.get('createdAt') or item.get('publishedAt') or item.get('date')),
+    }
+
+
+def _find_widget_states(payload) -> Optional[Dict]:
+    if isinstance(payload, dict):
+        states = payload.get('widgetStates')
+        if isinstance(states, dict):
+            return states
+        for value in payload.values():
+            found = _find_widget_states(value)
+            if found:
+                return found
+    elif isinstance(payload, list):
+        for value in payload:
+            found = _find_widget_states(value)
+            if found:
+                return found
+    return None
+
+
+def _walk_reviews(node):
+    if isinstance(node, dict):
+        if _looks_like_review(node):
+            review = review_from_json(node)
+            if review:
+                yield review
+            return
+        for value in node.values():
+            yield from _walk_reviews(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk_reviews(value)
+
+
+def _looks_like_review(node: Dict) -> bool:
+    content = node.get('content')
+    has_text = isinstance(content, dict) and any(
+        key in content for key in ('comment', 'positive', 'negative')
+    )
+    has_identity = any(key in node for key in ('uuid', 'author', 'createdAt', 'publishedAt'))
+    return has_text and has_identity
+
+
+def _author_name(author) -> str:
+    if isinstance(author, str):
+        return author.strip()
+    if isinstance(author, dict):
+        name = ' '.join(
+            part for part in (author.get('firstName'), author.get('lastName')) if part
+        )
+        return (name or author.get('name') or author.get('nickname') or '').strip()
+    return ''
+
+
+def _to_int(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _to_date(value) -> str:
+    if isinstance(value, (int, float)) and value > 0:
+        if value > 1e11:
+            value = value / 1000
+        return datetime.fromtimestamp(value, tz=timezone.utc).strftime('%Y-%m-%d')
+    return str(value or '')
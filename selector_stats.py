@@ -0,0 +1,125 @@
+import json
+import os
+import threading
+from typing import Dict, List
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class SelectorStats:
+
+    def __init__(self, path: str = None, min_trials: int = 20, recent_weight: float = 0.1,
+                 collapse_ratio: float = 0.5, min_baseline: float = 0.5):
+        self.path = path
+        self.min_trials = min_trials
+        self.recent_weight = recent_weight
+        self.collapse_ratio = collapse_ratio
+        self.min_baseline = min_baseline
+        self.resets = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._keys = self._load()
+
+    def order(self, key: str, selectors: List[str]) -> List[str]:
+        with self._lock:
+            entry = self._entry(key)
+            counts = entry['selectors']
+            ranked = []
+            for index, selector in enumerate(selectors):
+                hits, misses = counts.get(selector, (0, 0))
+                if hits == 0 and misses >= self.min_trials:
+                    continue
+                # сглаживание Лапласа: у непроверенного селектора оценка 0.5, исходный порядок сохраняется
+                ranked.append((-(hits + 1) / (hits + misses + 2), index, selector))
+        if not ranked:
+            # все кандидаты мёртвые: изредка проверяем их снова, вдруг поле вернулось в разметку
+            return list(selectors) if entry['lookups'] % self.min_trials == 0 else []
+        return [selector for _, _, selector in sorted(ranked)]
+
+    def record(self, key: str, selector: str, hit: bool):
+        with self._lock:
+            counts = self._entry(key)['selectors']
+            hits, misses = counts.get(selector, (0, 0))
+            counts[selector] = (hits + 1, misses) if hit else (hits, misses + 1)
+            self._dirty = True
+
+    def record_lookup(self, key: str, success: bool):
+        with self._lock:
+            entry = self._entry(key)
+            entry['lookups'] += 1
+            entry['successes'] += int(success)
+            entry['recent'] += self.recent_weight * (float(success) - entry['recent'])
+            self._dirty = True
+
+            baseline = entry['successes'] / entry['lookups']
+            # для редко находимых полей (дата, автор) серия промахов — обычное дело, а не редизайн
+            collapsed = baseline >= self.min_baseline and entry['recent'] < baseline * self.collapse_ratio
+            if entry['lookups'] >= self.min_trials and collapsed:
+                # разметка сменилась: забываем выученный порядок и снова пробуем все селекторы
+                self._keys[key] = self._new_entry()
+                self.resets += 1
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                key: {
+                    'lookups': entry['lookups'],
+                    'success_rate': entry['successes'] / entry['lookups'] if entry['lookups'] else 0.0,
+                    'dead': sorted(
+                        selector for selector, (hits, misses) in entry['selectors'].items()
+                        if hits == 0 and misses >= self.min_trials
+                    ),
+                }
+                for key, entry in self._keys.items()
+            }
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                key: dict(entry, selectors={selector: list(counts) for selector, counts in entry['selectors'].items()})
+                for key, entry in self._keys.items()
+            }
+            self._dirty = False
+
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def _entry(self, key: str) -> Dict:
+        if key not in self._keys:
+            self._keys[key] = self._new_entry()
+        return self._keys[key]
+
+    def _new_entry(self) -> Dict:
+        return {'selectors': {}, 'lookups': 0, 'successes': 0, 'recent': 1.0}
+
+    def _load(self) -> Dict:
+        if not (self.path and os.path.exists(self.path)):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        keys = {}
+        for key, entry in data.items():
+            loaded = self._new_entry()
+            loaded.update(entry)
+            loaded['selectors'] = {selector: tuple(counts) for selector, counts in entry.get('selectors', {}).items()}
+            keys[key] = loaded
+        return keys
+
+
+def selector_stats(path: str) -> SelectorStats:
+    key = os.path.abspath(path)
+    with _stats_lock:
+        if key not in _stats:
+            _stats[key] = SelectorStats(key)
+        return _stats[key]
@@ -8,14 +8,53 @@ from typing import Dict
 from config import ParserConfig
 from ozon_reviews_parser import OzonReviewsParserImproved
 
-def parse_ozon_reviews(product_url: str, config: ParserConfig = None) -> Dict:
+def create_parser(config: ParserConfig, pool=None):
+    if config.backend == 'http':
+        from http_backend import OzonHttpReviewsParser
+        return OzonHttpReviewsParser(config)
+    if config.ssr_fast_path:
+        from ssr_fast_path import SsrFastPathParser
+        return SsrFastPathParser(config, pool)
+    return OzonReviewsParserImproved(config=config, pool=pool)
+
+def build_result(product_url: str, parser: OzonReviewsParserImproved, reviews, start_time: datetime,
+                 end_time: datetime) -> Dict:
+    duration = end_time - start_time
+    return {
+        'product_url': product_url,
+        'product_id': parser.product_id,
+        'total_reviews': len(reviews),
+        'reviews': reviews,
+        'parsing_info': {
+            'start_time': start_time.isoformat(),
+            'end_time': end_time.isoformat(),
+            'duration_seconds': duration.total_seconds(),
+            'browser_wait_seconds': parser.browser_wait_seconds,
+            'scrape_seconds': duration.total_seconds() - parser.browser_wait_seconds,
+            'browser_rss_mb': round(parser.browser_rss_bytes / 1024 / 1024, 1),
+            'crash_restarts': getattr(parser, 'crash_restarts', 0),
+            'served_by': getattr(parser, 'served_by', None),
+            'parser_version': '1.0'
+        }
+    }
+
+def save_result(result: Dict, config: ParserConfig) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    product_id = result['product_id'] or "unknown"
+    filename = f"{config.output_dir}/ozon_reviews_{product_id}_{timestamp}.json"
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    return filename
+
+def parse_ozon_reviews(product_url: str, config: ParserConfig = None, pool=None) -> Dict:
     if config is None:
         config = ParserConfig()
 
     Path(config.output_dir).mkdir(exist_ok=True)
     Path(config.screenshots_dir).mkdir(exist_ok=True)
 
-    parser = OzonReviewsParserImproved(config=config)
+    parser = create_parser(config, pool)
 
     try:
         print(f"Начинаем парсинг отзывов для: {product_url}")
@@ -26,25 +65,8 @@ def parse_ozon_reviews(product_url: str, config: ParserConfig = None) -> Dict:
         end_time = datetime.now()
         duration = end_time - start_time
 
-        result = {
-            'product_url': product_url,
-            'product_id': parser.product_id,
-            'total_reviews': len(reviews),
-            'reviews': reviews,
-            'parsing_info': {
-                'start_time': start_time.isoformat(),
-                'end_time': end_time.isoformat(),
-                'duration_seconds': duration.total_seconds(),
-                'parser_version': '1.0'
-            }
-        }
-
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        product_id = parser.product_id or "unknown"
-        filename = f"{config.output_dir}/ozon_reviews_{product_id}_{timestamp}.json"
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        result = build_result(product_url, parser, reviews, start_time, end_time)
+        filename = save_result(result, config)
 
         print(f"Парсинг завершен!")
         print(f"Найдено отзывов: {len(reviews)}")
@@ -76,6 +98,19 @@ def main():
         headless=False,
         max_pages=10
     )
+    for arg in sys.argv[2:]:
+        if arg.startswith('--attach='):
+            config.debugger_address = arg.split('=', 1)[1]
+        elif arg == '--ssr':
+            config.ssr_fast_path = True
+        elif arg == '--mobile':
+            config.device_mode = 'mobile'
+        elif arg == '--hybrid':
+            config.hybrid_mode = True
+        elif arg.startswith('--remote='):
+            config.remote_endpoints = arg.split('=', 1)[1]
+        elif arg == '--selector-stats':
+            config.selector_stats_path = ".selector_stats.json"
     config.post_init()
 
     result = parse_ozon_reviews(product_url, config)
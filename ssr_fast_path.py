@@ -0,0 +1,120 @@
+import threading
+from typing import Dict, List
+
+import requests
+
+from backends import HttpPageBackend
+from http_backend import shared_session
+from ozon_reviews_parser import OzonReviewsParserImproved
+from page_scripts import WIDGET_STATE_SELECTOR
+from review_json import REVIEW_WIDGET_PREFIXES, dedupe_reviews, extract_reviews_from_widget_state
+
+
+class FastPathStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fallbacks = 0
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.fallbacks = 0
+
+    def record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.fallbacks += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.fallbacks
+        return self.hits / total if total else 0.0
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {'ssr_hits': self.hits, 'browser_fallbacks': self.fallbacks, 'ssr_hit_rate': self.hit_rate}
+
+
+fast_path_stats = FastPathStats()
+
+
+def reviews_from_ssr(backend) -> List[Dict]:
+    reviews = []
+    for node in backend.find_all(WIDGET_STATE_SELECTOR):
+        key = backend.attribute(node, 'id')[len('state-'):]
+        if key.startswith(REVIEW_WIDGET_PREFIXES):
+            reviews.extend(extract_reviews_from_widget_state(backend.attribute(node, 'data-state')))
+    return dedupe_reviews(reviews)
+
+
+class SsrFastPathParser:
+
+    def __init__(self, config, pool=None, session: requests.Session = None):
+        self.config = config
+        self.pool = pool
+        self.session = session or shared_session(config)
+        self.driver = None
+        self.fallback = None
+        self.reviews = []
+        self.product_id = None
+        self.browser_wait_seconds = 0.0
+        self.browser_rss_bytes = 0
+        self.crash_restarts = 0
+        self.served_by = None
+        self.debug = True
+
+    def _debug_print(self, message):
+        if self.debug:
+            print(f"[DEBUG] {message}")
+
+    def parse_product_reviews(self, product_url: str) -> List[Dict]:
+        self.fallback = None
+        self.reviews = self.parse_ssr(product_url)
+        hit = len(self.reviews) >= self.config.ssr_min_reviews
+        fast_path_stats.record(hit)
+        if hit:
+            self.served_by = 'ssr'
+            self._debug_print(f"Отзывы из серверной разметки: {len(self.reviews)}")
+            return self.reviews
+
+        self._debug_print("В серверной разметке нет отзывов, открываем браузер")
+        self.served_by = 'browser'
+        self.fallback = OzonReviewsParserImproved(config=self.config, pool=self.pool)
+        self.fallback.debug = self.debug
+        self.reviews = self.fallback.parse_product_reviews(product_url)
+        self.browser_wait_seconds = self.fallback.browser_wait_seconds
+        self.browser_rss_bytes = self.fallback.browser_rss_bytes
+        self.crash_restarts = self.fallback.crash_restarts
+        return self.reviews
+
+    def parse_ssr(self, product_url: str) -> List[Dict]:
+        parser = OzonReviewsParserImproved(config=self.config)
+        parser.debug = False
+        self.product_id = parser._extract_product_id(product_url)
+
+        base_url = product_url.split('?')[0].rstrip('/')
+        for url in [product_url, base_url + '/reviews/']:
+            try:
+                backend = HttpPageBackend(self.session, url, self.config.http_timeout)
+            except requests.RequestException as e:
+                self._debug_print(f"Серверная разметка недоступна для {url}: {e}")
+                continue
+
+            reviews = reviews_from_ssr(backend)
+            if not reviews:
+                # без перехода на вкладку отзывов и без поиска по всем div: в SSR считаются только карточки
+                parser.backend = backend
+                parser.reviews = []
+                parser._find_reviews_on_product_page()
+                reviews = parser.reviews
+            if reviews:
+                return reviews
+        return []
+
+    def save_screenshot(self, filename: str):
+        if self.fallback:
+            self.fallback.save_screenshot(filename)
@@ -0,0 +1,174 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List
+
+from crash_recovery import is_crash
+from driver_factory import prepare_tab
+from ozon_reviews_parser import OzonReviewsParserImproved
+from page_scripts import READY_SELECTORS, REVIEWS_READY_SCRIPT, SCROLL_TO_REVIEWS_SCRIPT
+from simple_runner import build_result, save_result
+
+
+class TabScheduler:
+    # Параллельно идёт только загрузка страниц: разбор готовой вкладки (переход к отзывам,
+    # ожидание карточек) занимает драйвер целиком, остальные вкладки в это время не опрашиваются.
+
+    def __init__(self, driver, config, pool=None):
+        self.driver = driver
+        self.config = config
+        self.pool = pool
+        self.tabs = max(1, config.tabs_per_browser)
+        self.poll_interval = 0.2
+        self.crashed = False
+
+    def run(self, url_queue: queue.Queue, max_products: int = None) -> List[Dict]:
+        # после max_products товаров вкладки дорабатывают и браузер возвращается в пул:
+        # там он сбрасывается или перезапускается по лимитам страниц, возраста и памяти
+        handles = self._open_tabs()
+        active = {}
+        results = []
+        started = 0
+
+        while True:
+            for handle in handles:
+                if handle in active:
+                    continue
+                if max_products and started >= max_products:
+                    break
+                try:
+                    product_url = url_queue.get_nowait()
+                except queue.Empty:
+                    break
+                started += 1
+                try:
+                    active[handle] = self._start(handle, product_url)
+                except Exception as e:
+                    print(f"[TAB] Ошибка открытия {product_url}: {e}")
+                    results.append(_error_result(product_url, e))
+                    if is_crash(e) and not self._browser_alive():
+                        self.crashed = True
+                        break
+
+            if self.crashed or not active:
+                break
+
+            handle, error = self._wait_for_ready_tab(active)
+            parser, product_url, start_time = active.pop(handle)
+            if error is None:
+                results.append(self._finish(handle, parser, product_url, start_time))
+                continue
+
+            print(f"[TAB] Вкладка с {product_url} недоступна: {error}")
+            results.append(_error_result(product_url, error))
+            handles.remove(handle)
+            if not handles or not self._browser_alive():
+                self.crashed = True
+                break
+
+        for _, product_url, _ in active.values():
+            results.append(_error_result(product_url, RuntimeError("Браузер упал во время загрузки")))
+        return results
+
+    def _open_tabs(self) -> List[str]:
+        handles = list(self.driver.window_handles[:1])
+        while len(handles) < self.tabs:
+            self.driver.switch_to.new_window('tab')
+            prepare_tab(self.driver, self.config)
+            handles.append(self.driver.current_window_handle)
+        return handles
+
+    def _start(self, handle: str, product_url: str):
+        self.driver.switch_to.window(handle)
+        parser = OzonReviewsParserImproved(config=self.config, pool=self.pool)
+        parser.attach_driver(self.driver)
+        if self.pool:
+            parser.profile_dir = self.pool.stats(self.driver).profile_dir
+        parser.product_id = parser._extract_product_id(product_url)
+
+        print(f"[TAB] Открываем {product_url}")
+        parser._open_url(product_url)
+        return parser, product_url, datetime.now()
+
+    def _wait_for_ready_tab(self, active: Dict):
+        timeout = self.config.page_load_timeout
+        while True:
+            for handle, (_, _, start_time) in active.items():
+                try:
+                    self.driver.switch_to.window(handle)
+                except Exception as e:
+                    return handle, e
+                try:
+                    ready = self.driver.execute_script(REVIEWS_READY_SCRIPT, READY_SELECTORS)
+                    if not ready:
+                        self.driver.execute_script(SCROLL_TO_REVIEWS_SCRIPT)
+                except Exception as e:
+                    if is_crash(e):
+                        return handle, e
+                    ready = False
+                if ready or (datetime.now() - start_time).total_seconds() > timeout:
+                    return handle, None
+            time.sleep(self.poll_interval)
+
+    def _browser_alive(self) -> bool:
+        try:
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def _finish(self, handle: str, parser: OzonReviewsParserImproved, product_url: str,
+                start_time: datetime) -> Dict:
+        try:
+            self.driver.switch_to.window(handle)
+            reviews = parser.parse_loaded_page()
+        except Exception as e:
+            print(f"[TAB] Ошибка для {product_url}: {e}")
+            return _error_result(product_url, e)
+
+        result = build_result(product_url, parser, reviews, start_time, datetime.now())
+        filename = save_result(result, self.config)
+        print(f"[TAB] Завершен парсинг: {product_url}, отзывов: {len(reviews)}, файл: {filename}")
+        return result
+
+
+def parse_with_tabs(product_urls: List[str], config, pool, max_workers: int = 1) -> List[Dict]:
+    url_queue = queue.Queue()
+    for url in product_urls:
+        url_queue.put(url)
+
+    def worker():
+        results = []
+        try:
+            while not url_queue.empty():
+                driver = pool.acquire()
+                scheduler = TabScheduler(driver, config, pool)
+                try:
+                    results.extend(scheduler.run(url_queue, max_products=scheduler.tabs))
+                except Exception:
+                    scheduler.crashed = True
+                    raise
+                finally:
+                    if scheduler.crashed:
+                        pool.discard(driver)
+                    else:
+                        pool.release(driver)
+        except Exception as e:
+            print(f"Ошибка воркера вкладок: {e}")
+        return results
+
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(worker) for _ in range(max_workers)]
+        for future in futures:
+            results.extend(future.result())
+
+    # все воркеры остановились раньше, чем очередь опустела
+    while not url_queue.empty():
+        product_url = url_queue.get_nowait()
+        results.append(_error_result(product_url, RuntimeError("Нет доступного браузера")))
+    return results
+
+
+def _error_result(product_url: str, error: Exception) -> Dict:
+    return {'error': str(error), 'product_url': product_url, 'reviews': []}
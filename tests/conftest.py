@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PAYLOADS_DIR = os.path.join(FIXTURES_DIR, 'payloads')
+PAGES_DIR = os.path.join(FIXTURES_DIR, 'pages')
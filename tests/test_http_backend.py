@@ -0,0 +1,75 @@
+import os
+import shutil
+
+import pytest
+
+from config import ParserConfig
+from conftest import PAYLOADS_DIR
+from http_backend import HttpBackendError, OzonHttpReviewsParser
+from replay_server import start_replay_server
+
+PRODUCT_URL = 'https://www.ozon.ru/product/chaynik-elektricheskiy-123456/'
+
+
+def make_parser(replay_dir, tmp_path, **overrides):
+    server, base_url = start_replay_server(replay_dir)
+    config = ParserConfig(
+        api_base_url=base_url,
+        http_delay_between_pages=0,
+        output_dir=str(tmp_path / 'output'),
+        screenshots_dir=str(tmp_path / 'screenshots'),
+        **overrides
+    )
+    parser = OzonHttpReviewsParser(config)
+    parser.debug = False
+    return server, parser
+
+
+@pytest.fixture
+def replay(tmp_path):
+    servers = []
+
+    def start(replay_dir=PAYLOADS_DIR, **overrides):
+        server, parser = make_parser(replay_dir, tmp_path, **overrides)
+        servers.append(server)
+        return parser
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_pages_until_next_page_is_missing(replay):
+    parser = replay()
+
+    reviews = parser.parse_product_reviews(PRODUCT_URL)
+
+    # третьей страницы в записи нет: две полученные страницы сохраняются
+    assert [review['id'] for review in reviews] == ['a1', 'a2', 'a3']
+    assert parser.product_id == '123456'
+    assert parser.requests_made == 3
+
+
+def test_max_pages(replay):
+    parser = replay(max_pages=1)
+
+    assert [review['id'] for review in parser.parse_product_reviews(PRODUCT_URL)] == ['a1', 'a2']
+    assert parser.requests_made == 1
+
+
+def test_missing_first_page(replay, tmp_path):
+    parser = replay(str(tmp_path))
+
+    with pytest.raises(HttpBackendError):
+        parser.fetch_reviews('/product/chaynik-elektricheskiy-123456/reviews/')
+    assert parser.parse_product_reviews(PRODUCT_URL) == []
+
+
+def test_records_payloads(replay, tmp_path):
+    payloads_dir = tmp_path / 'recorded'
+    parser = replay(payloads_dir=str(payloads_dir))
+
+    parser.parse_product_reviews(PRODUCT_URL)
+
+    assert sorted(os.listdir(payloads_dir)) == sorted(os.listdir(PAYLOADS_DIR))
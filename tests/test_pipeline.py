@@ -0,0 +1,63 @@
+import os
+
+from backends import SoupBackend
+from conftest import PAGES_DIR
+from ozon_reviews_parser import OzonReviewsParserImproved
+
+PRODUCT_URL = 'https://www.ozon.ru/product/chaynik-elektricheskiy-123456/'
+REVIEWS_URL = PRODUCT_URL + 'reviews/'
+
+
+def page(name):
+    with open(os.path.join(PAGES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def parse(name, pages=None):
+    parser = OzonReviewsParserImproved()
+    parser.debug = False
+    backend = SoupBackend(page(name), PRODUCT_URL, pages)
+    reviews = parser.parse_with_backend(backend, PRODUCT_URL)
+    return parser, backend, reviews
+
+
+def test_container_cards():
+    parser, backend, reviews = parse('product_cards.html')
+
+    assert [(review['id'], review['author'], review['rating'], review['date']) for review in reviews] == [
+        ('r-1', 'Ольга С.', 4, '12 марта 2024'),
+        ('r-2', 'Иван', 5, '3 апреля 2024'),
+    ]
+    assert reviews[0]['text'] == 'Быстро кипятит, крышка открывается удобно.'
+    assert parser.product_id == '123456'
+    assert backend.current_url == PRODUCT_URL
+    assert 'open_reviews' not in parser.completed_steps
+
+
+def test_universal_fallback_inside_container():
+    _, _, reviews = parse('product_universal.html')
+
+    # карточек нет: берутся div контейнера с текстом длиннее 50 символов
+    assert [review['text'] for review in reviews] == [
+        'Покупали в подарок родителям, пользуются каждый день и довольны качеством.',
+        'Через месяц начал подтекать у основания, пришлось сдать по гарантии.',
+    ]
+    assert {review['author'] for review in reviews} == {'Неизвестный автор'}
+
+
+def test_reviews_link_navigation():
+    parser, backend, reviews = parse('product_link.html', {REVIEWS_URL: page('reviews_page.html')})
+
+    assert backend.current_url == REVIEWS_URL
+    assert parser.completed_steps['product_page'] is False
+    assert [(review['rating'], review['date']) for review in reviews] == [(4, '5 мая 2024'), (2, '17.06.2024')]
+    assert reviews[0]['text'].startswith('Хороший чайник')
+    assert all('меню' not in review['text'] for review in reviews)
+
+
+def test_missing_reviews_page():
+    parser, backend, reviews = parse('product_link.html')
+
+    # страницы отзывов нет в записи: бэкенд остаётся на странице товара, ничего не найдено
+    assert reviews == []
+    assert backend.current_url == PRODUCT_URL
@@ -0,0 +1,80 @@
+import os
+
+from bs4 import BeautifulSoup
+
+from conftest import PAGES_DIR
+from ozon_reviews_parser import FILLED_STAR_SELECTOR, RATING_SELECTORS
+from review_blocks import block_params, detect_review_blocks
+
+PARAMS = block_params(RATING_SELECTORS, FILLED_STAR_SELECTOR)
+
+
+def card(index, stars=4, css_class='card'):
+    icons = ''.join(f'<i data-index="{star}"></i>' for star in range(1, stars + 1))
+    return (
+        f'<div class="{css_class}"><div class="rating">{icons}</div>'
+        f'<div class="body"><div class="text">Отзыв {index}: чайник закипает быстро, корпус не греется, '
+        f'крышка открывается одной рукой.</div></div><span>1{index} марта 2024</span></div>'
+    )
+
+
+def detect(html, **overrides):
+    return detect_review_blocks(BeautifulSoup(html, 'html.parser'), dict(PARAMS, **overrides))
+
+
+def test_list_container_is_not_a_block():
+    html = '<div class="list">' + card(1) + card(2, stars=2) + '</div>'
+    # весь список короче max_text и тоже набирает баллы, но в нём две карточки
+    assert len(BeautifulSoup(html, 'html.parser').get_text()) < PARAMS['max_text']
+
+    blocks = detect(html)
+
+    assert [(block['element_class'], block['rating'], block['date']) for block in blocks] == [
+        ('card', 4, '11 марта 2024'),
+        ('card', 2, '12 марта 2024'),
+    ]
+
+
+def test_nested_card_wrappers_yield_one_block_each():
+    html = '<div class="list">' + ''.join(f'<div class="wrap">{card(index)}</div>' for index in range(3)) + '</div>'
+
+    blocks = detect(html)
+
+    # обёртка, карточка и её тело совпадают по тексту: остаётся только внешний элемент
+    assert [block['element_class'] for block in blocks] == ['wrap', 'wrap', 'wrap']
+    assert [block['date'] for block in blocks] == ['10 марта 2024', '11 марта 2024', '12 марта 2024']
+
+
+def test_single_review_wrapper():
+    html = '<div class="page"><div class="single">' + card(1) + '</div><div class="menu">меню</div></div>'
+
+    blocks = detect(html)
+
+    assert len(blocks) == 1
+    assert blocks[0]['element_class'] == 'single'
+    assert blocks[0]['rating'] == 4
+    assert blocks[0]['text'].startswith('Отзыв 1')
+
+
+def test_scoring_threshold():
+    dated_only = '<div class="list"><div class="note">Доставка 12 марта 2024 в пункт выдачи</div></div>'
+
+    assert detect(dated_only) == []
+    assert [block['score'] for block in detect(dated_only, threshold=2)] == [2]
+
+
+def test_skip_words_and_limit():
+    html = '<div class="list">' + ''.join(card(index) for index in range(5)) + '</div>'
+
+    assert len(detect(html, limit=3)) == 3
+    assert detect(html.replace('чайник', 'реклама')) == []
+
+
+def test_recorded_reviews_page():
+    with open(os.path.join(PAGES_DIR, 'reviews_page.html'), 'r', encoding='utf-8') as f:
+        blocks = detect(f.read())
+
+    assert [(block['element_class'], block['rating'], block['date']) for block in blocks] == [
+        ('item', 4, '5 мая 2024'),
+        ('item', 2, '17.06.2024'),
+    ]
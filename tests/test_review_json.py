@@ -0,0 +1,63 @@
+import json
+import os
+
+from conftest import FIXTURES_DIR, PAYLOADS_DIR
+from review_json import extract_reviews_from_files, extract_reviews_from_payload, is_review_payload_url
+
+FIRST_PAGE = os.path.join(PAYLOADS_DIR, 'product_chaynik_elektricheskiy_123456_reviews.json')
+SECOND_PAGE = os.path.join(PAYLOADS_DIR, 'product_chaynik_elektricheskiy_123456_reviews_page_2.json')
+
+
+def read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_reviews_from_widget_states():
+    reviews = extract_reviews_from_payload(read(FIRST_PAGE))
+
+    assert [review['id'] for review in reviews] == ['a1', 'a2']
+    assert reviews[0] == {
+        'id': 'a1',
+        'author': 'Ольга С.',
+        'rating': 5,
+        'text': 'Быстро кипятит\nШумный\nВ целом доволен',
+        'date': '2023-11-14',
+    }
+    assert reviews[1]['author'] == 'kettle_fan'
+    assert reviews[1]['date'] == '2023-11-15'
+
+
+def test_non_review_widgets_are_ignored():
+    payload = json.loads(read(FIRST_PAGE))
+    del payload['widgetStates']['webListReviews-3246457-default-1']
+
+    assert extract_reviews_from_payload(payload) == []
+
+
+def test_reviews_without_widget_states():
+    reviews = extract_reviews_from_payload(read(os.path.join(FIXTURES_DIR, 'widget_payload.json')))
+
+    assert reviews == [{
+        'id': '777',
+        'author': 'Пётр',
+        'rating': 2,
+        'text': 'Треснул корпус',
+        'date': '2024-01-05',
+    }]
+
+
+def test_pages_are_deduplicated():
+    reviews = extract_reviews_from_files([FIRST_PAGE, SECOND_PAGE])
+
+    assert [review['id'] for review in reviews] == ['a1', 'a2', 'a3']
+
+
+def test_invalid_payload():
+    assert extract_reviews_from_payload('<html>captcha</html>') == []
+    assert extract_reviews_from_payload(b'') == []
+
+
+def test_review_payload_urls():
+    assert is_review_payload_url('https://www.ozon.ru/api/entrypoint-api.bx/page/json/v2?url=/product/1/reviews/')
+    assert not is_review_payload_url('https://www.ozon.ru/api/other')
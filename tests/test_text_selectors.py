@@ -0,0 +1,61 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from text_selectors import compile_selector, select_soup
+
+
+@pytest.mark.parametrize('selector, css, texts', [
+    ('div.review', 'div.review', ()),
+    ('a:contains("Отзывы")', 'a', (('Отзывы', False),)),
+    ('a:icontains("отзыв")', 'a', (('отзыв', True),)),
+    (':contains("x")', '*', (('x', False),)),
+    ('div :contains("x")', 'div *', (('x', False),)),
+    ('div > :contains("x")', 'div > *', (('x', False),)),
+    ('div >:icontains("x")', 'div > *', (('x', True),)),
+    ('li + :contains("x")', 'li + *', (('x', False),)),
+    ("span:contains('a'):icontains(\"B\")", 'span', (('a', False), ('B', True))),
+])
+def test_compile(selector, css, texts):
+    compiled = compile_selector(selector)
+
+    assert compiled.css == css
+    assert compiled.texts == texts
+
+
+@pytest.mark.parametrize('selector', [
+    'div:contains("x") span',
+    'div:contains("x") > a',
+    'a:icontains("x").link',
+])
+def test_predicate_must_be_last(selector):
+    with pytest.raises(ValueError):
+        compile_selector(selector)
+
+
+HTML = """
+<div id="outer">
+  <a id="link" href="/reviews">Все ОТЗЫВЫ <span id="count">12</span></a>
+  <div id="inner"><span id="author">пользователь Ольга</span></div>
+</div>
+"""
+
+
+def ids(selector):
+    return [element['id'] for element in select_soup(BeautifulSoup(HTML, 'html.parser'), selector)]
+
+
+@pytest.mark.parametrize('selector, expected', [
+    # самый вложенный элемент, а не все его предки
+    ('div:contains("Ольга")', ['inner']),
+    (':contains("Ольга")', ['author']),
+    ('div :contains("Ольга")', ['author']),
+    ('#outer > :contains("Ольга")', ['inner']),
+    # регистр
+    ('a:contains("отзывы")', []),
+    ('a:icontains("отзывы")', ['link']),
+    ('a:icontains("ОТЗЫВ"):contains("12")', ['link']),
+    ('span:icontains("нет такого")', []),
+    ('span#count', ['count']),
+])
+def test_select_soup(selector, expected):
+    assert ids(selector) == expected
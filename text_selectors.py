@@ -0,0 +1,76 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# диалект поверх CSS: 'a:icontains("отзыв")', 'div:contains("@")'.
+# Текстовые условия допустимы только в конце селектора и отбирают самые вложенные элементы,
+# иначе вместе с нужным span совпали бы все его предки.
+TEXT_PREDICATE = re.compile(r':(i?contains)\(\s*(["\'])(.*?)\2\s*\)')
+
+
+@dataclass(frozen=True)
+class TextSelector:
+    source: str
+    css: str
+    texts: Tuple[Tuple[str, bool], ...] = ()
+
+    def matches_text(self, text: str) -> bool:
+        for needle, ignore_case in self.texts:
+            if ignore_case:
+                if needle.lower() not in text.lower():
+                    return False
+            elif needle not in text:
+                return False
+        return True
+
+    @property
+    def soup_selector(self) -> str:
+        # регистрозависимые условия проверяет сам soupsieve, остальные фильтруются в Python
+        contains = ''.join(
+            f':-soup-contains("{_escape(needle)}")' for needle, ignore_case in self.texts if not ignore_case
+        )
+        return self.css + contains
+
+    def script_arg(self) -> Dict:
+        return {'source': self.source, 'css': self.css, 'texts': [list(text) for text in self.texts]}
+
+
+@lru_cache(maxsize=None)
+def compile_selector(selector: str) -> TextSelector:
+    first = TEXT_PREDICATE.search(selector)
+    if not first:
+        return TextSelector(selector, selector)
+    if TEXT_PREDICATE.sub('', selector[first.start():]).strip():
+        raise ValueError(f"Текстовые условия допустимы только в конце селектора: {selector}")
+
+    css = selector[:first.start()]
+    # 'div :contains(...)' ищет потомков div: комбинатор проверяется до отбрасывания пробелов
+    if not css.strip() or css[-1].isspace() or css.rstrip()[-1] in '>+~':
+        css = (css.rstrip() + ' *').lstrip()
+    texts = tuple(
+        (needle, kind == 'icontains') for kind, _, needle in TEXT_PREDICATE.findall(selector)
+    )
+    return TextSelector(selector, css, texts)
+
+
+def select_soup(node, selector: str) -> List:
+    compiled = compile_selector(selector)
+    if not compiled.texts:
+        return node.select(selector)
+    elements = [
+        element for element in node.select(compiled.soup_selector)
+        if compiled.matches_text(element.get_text())
+    ]
+    return innermost(elements)
+
+
+def innermost(elements: List) -> List:
+    ancestors = set()
+    for element in elements:
+        ancestors.update(id(parent) for parent in element.parents)
+    return [element for element in elements if id(element) not in ancestors]
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('"', '\\"')